@@ -1,9 +1,17 @@
-import ast, os
+import ast, os, time
+import block_summary, dataflow
+from expr_memo import ExprMemo
 from flow_follow import *
+from loop_closure import LoopClosure
+from loop_memo import LoopSummary, Recorder, fingerprint
+from memory import MemoryProfile
+from options import Options
+from stats import Stats
 import logging
-import functools
 
-TERMINATION_LEAK = 'TERMINATION_LEAK' in os.environ
+# Expressions evaluated on an explicit stack (see `IFVisitor.evaluate`)
+COMPOUND = (ast.BinOp, ast.BoolOp, ast.UnaryOp, ast.Compare, ast.Attribute,
+            ast.Call)
 
 
 class IFVisitor():
@@ -12,16 +20,107 @@ class IFVisitor():
     variables.
     """
 
-    def __init__(self):
+    def __init__(self, options: Options = None):
         # Context multilabel used for conditionals and loops
         self.contexts = [MultiLabel({})]
 
         # Wheter we are on a stopping loop
         self.stop = False
 
+        self.options = options if options is not None else Options()
+        self.max_flows = self.options.max_flows
+        self.stats = Stats()
+        self.start = time.monotonic()
+
+        # Set when a budget is exceeded: loops are no longer iterated up to
+        # their fixed point (degraded) or the analysis stops (aborted)
+        self.degraded = False
+        self.aborted = False
+
+        # Names live after each statement (see `dataflow.liveness`)
+        self.live = {}
+
+        # Maps each loop to the (sorted) names it mentions, and each loop and
+        # fingerprint of its input to the summary of its analysis (see
+        # `loop_memo`)
+        self.loop_names = {}
+        self.loop_summaries = {}
+
+        # While loops into which the for loops are converted (see `visit_for`)
+        self.lowered = {}
+
+        # Number of loops the statements being analysed are in, and the
+        # summaries of the blocks of straight-line code (see `block_summary`)
+        # that start at each statement
+        self.loop_depth = 0
+        self.blocks = {}
+
+        # Maps each loop whose body is a single block to its flow graph (see
+        # `loop_closure`)
+        self.closures = {}
+
+        # Memory accounting, if requested (see `memory.MemoryProfile`)
+        self.memory = MemoryProfile() if self.options.memory_profile else None
+
+        # Multilabels of the names and attribute chains read by expressions
+        # (see `expr_memo`)
+        self.reads = ExprMemo() if self.options.expr_memo else None
+
     def current_context(self):
         return self.contexts[-1].clone()
 
+    def widen(self, value):
+        """
+        Bounds the number of flows of a multilabel or multilabelling, according
+        to the options (changes it in place)
+        """
+        if self.max_flows is not None:
+            value.widen(self.max_flows)
+        return value
+
+    def exceed(self, budget: str, node: ast.AST):
+        logging.warning(
+            f"{budget} budget exceeded at line {node.lineno}, degrading analysis"
+        )
+        self.stats.exceeded(budget, node.lineno)
+        self.degraded = True
+        # Keep a single summary flow for each source from now on
+        self.max_flows = 1
+
+    def prune(self, mtlb: MultiLabelling, live: set[str]):
+        """
+        Removes the dead names from a multilabelling (in place)
+        """
+        self.stats.peak("peak_variables", len(mtlb.mapping))
+        version = mtlb.version
+        dead = mtlb.prune(live)
+        self.stats.peak("peak_live_variables", len(mtlb.mapping))
+        if self.reads is not None:
+            self.reads.carry(mtlb, version, mtlb, dead)
+
+    def check_budgets(self, node: ast.AST, mtlb: MultiLabelling):
+        """
+        Checks the budgets before analysing a statement. Exceeding the
+        iteration or state budget degrades the analysis (flows are widened and
+        loops are analysed with a single iteration), while exceeding the time
+        budget stops it (the findings gathered so far are kept)
+        """
+        options = self.options
+        if options.time_budget is not None and time.monotonic(
+        ) - self.start > options.time_budget:
+            self.exceed("time", node)
+            self.aborted = True
+
+        if options.iteration_budget is not None and self.stats.get(
+                "iterations") > options.iteration_budget:
+            self.exceed("iterations", node)
+
+        if options.state_budget is not None:
+            size = mtlb.size()
+            if size > options.state_budget:
+                self.exceed("state", node)
+                self.widen(mtlb)
+
     def flat_vars(node: ast.AST) -> list[str]:
         """
         Receives an attribute chain (all elements are either names, attributes or calls)
@@ -32,21 +131,28 @@ class IFVisitor():
             - flat_vars(a.b().c) = [a, b(), c]
         """
 
-        assert (type(node) == ast.Name or type(node) == ast.Attribute
-                or type(node) == ast.Call)
-        if type(node) == ast.Name: return [node]
-        elif type(node) == ast.Attribute:
-            return IFVisitor.flat_vars(
-                node.value) + [ast.Name(node.attr, None, lineno=node.lineno)]
-
-        # Call node (intuition is that it turns (a.b.c)() into a.b.(c()) )
-        inside = IFVisitor.flat_vars(node.func)
-        return inside[:-1] + [
-            ast.Call(func=inside[-1],
-                     args=node.args,
-                     keywords=node.keywords,
-                     lineno=node.lineno)
-        ]
+        # The chain is walked from its end to the name it starts with, and
+        # then decomposed in order (so long chains don't recurse)
+        chain = []
+        while True:
+            assert (type(node) == ast.Name or type(node) == ast.Attribute
+                    or type(node) == ast.Call)
+            if type(node) == ast.Name: break
+            chain.append(node)
+            node = node.value if type(node) == ast.Attribute else node.func
+
+        flat = [node]
+        for node in reversed(chain):
+            if type(node) == ast.Attribute:
+                flat.append(ast.Name(node.attr, None, lineno=node.lineno))
+            else:
+                # Call node (intuition is that it turns (a.b.c)() into
+                # a.b.(c()) )
+                flat[-1] = ast.Call(func=flat[-1],
+                                    args=node.args,
+                                    keywords=node.keywords,
+                                    lineno=node.lineno)
+        return flat
 
     def visit(self, node: ast.AST, policy: Policy, mtlb: MultiLabelling,
               vulns: Vulnerability):
@@ -65,30 +171,15 @@ class IFVisitor():
         elif type(node) == ast.If:
             return self.visit_if(node, policy, mtlb, vulns)
 
-        elif type(node) == ast.Compare:
-            return self.visit_compare(node, policy, mtlb, vulns)
-
         elif type(node) == ast.Expr:
             return self.visit_expr(node, policy, mtlb, vulns)
 
-        elif type(node) == ast.Call:
-            return self.visit_call(node, policy, mtlb, vulns)
+        elif type(node) in COMPOUND:
+            return self.evaluate(node, policy, mtlb, vulns)
 
         elif type(node) == ast.While:
             return self.visit_while(node, policy, mtlb, vulns)
 
-        elif type(node) == ast.BinOp:
-            return self.visit_bin_op(node, policy, mtlb, vulns)
-
-        elif type(node) == ast.Attribute:
-            return self.visit_attribute(node, policy, mtlb, vulns)
-
-        elif type(node) == ast.UnaryOp:
-            return self.visit_unary_op(node, policy, mtlb, vulns)
-
-        elif type(node) == ast.BoolOp:
-            return self.visit_bool_op(node, policy, mtlb, vulns)
-
         elif type(node) == ast.Pass:
             return self.visit_pass(node, policy, mtlb, vulns)
 
@@ -112,25 +203,88 @@ class IFVisitor():
                        mtlb: MultiLabelling,
                        vulns: Vulnerability) -> MultiLabelling:
 
-        for stmt in nodes:
-            if self.stop: return mtlb
+        i = 0
+        while i < len(nodes):
+            stmt = nodes[i]
+            if self.stop or self.aborted: return mtlb
+
+            self.check_budgets(stmt, mtlb)
+            if self.aborted: return mtlb
+
+            if self.memory is not None:
+                first, mark = stmt, self.memory.mark(mtlb)
+
+            summary, length = self.block_at(nodes, i, policy)
+            if summary is not None:
+                value = summary.apply(mtlb, self.contexts[-1], policy, vulns,
+                                      self.options)
+                stmt = summary.last
+                i += length
+            else:
+                value = self.visit(stmt, policy, mtlb, vulns)
+                i += 1
+
+            if self.memory is not None:
+                self.memory.record(
+                    first.lineno,
+                    "block" if summary is not None else "statement", mark,
+                    value if type(value) == MultiLabelling else mtlb)
 
-            value = self.visit(stmt, policy, mtlb, vulns)
             if type(value) == MultiLabelling:
+                # Only new multilabellings are pruned, the one received might
+                # still be used by the caller
+                if value is not mtlb and stmt in self.live and self.prunes():
+                    self.prune(value, self.live[stmt])
                 mtlb = value
 
         return mtlb
 
+    def block_at(self, nodes: list[ast.stmt], i: int,
+                 policy: Policy) -> tuple[block_summary.BlockSummary, int]:
+        """
+        Returns the summary of the block of straight-line code that starts at
+        the i-th statement, and its length (None if the statements are to be
+        analysed one by one)
+        """
+        # Summaries pay off when blocks are analysed several times (i.e. in
+        # loops). They are exact as long as flows aren't summarized (which
+        # depends on the number of flows) and the state budget isn't checked
+        # between their statements
+        if (not self.options.block_summaries or self.loop_depth == 0
+                or self.max_flows is not None
+                or self.options.state_budget is not None):
+            return None, 0
+
+        key = (nodes[i], policy)
+        if key not in self.blocks:
+            self.blocks[key] = block_summary.summarize(nodes[i:], policy)
+            if self.blocks[key][0] is not None:
+                self.stats.incr("block_summaries")
+        summary, length = self.blocks[key]
+        if summary is not None:
+            self.stats.incr("block_summaries_applied")
+        return summary, length
+
     def visit_module(self, node: ast.Module, policy: Policy,
                      mtlb: MultiLabelling,
                      vulns: Vulnerability) -> MultiLabelling:
-        return self.visit_multiple(node.body, policy, mtlb, vulns)
+        if self.prunes():
+            dataflow.liveness(node.body, set(), self.live)
+        if self.memory is None:
+            return self.visit_multiple(node.body, policy, mtlb, vulns)
+
+        self.memory.start()
+        try:
+            return self.visit_multiple(node.body, policy, mtlb, vulns)
+        finally:
+            self.memory.stop()
+            self.stats.memory = self.memory
 
     def visit_assign(self, node: ast.Assign, policy: Policy,
                      mtlb: MultiLabelling,
                      vulns: Vulnerability) -> MultiLabelling:
 
-        value_mlb = self.visit(node.value, policy, mtlb, vulns)
+        value_mlb = self.widen(self.visit(node.value, policy, mtlb, vulns))
         new = mtlb.clone()
 
         targets = []
@@ -157,11 +311,7 @@ class IFVisitor():
         # Add unitialized label if needed to left variables
         for target in left_targets:
             if new.mlabel_of(target) is None:
-                mlb = MultiLabel({})
-                for pattern in policy.patterns:
-                    # Create label with single source and no sanitizers
-                    mlb.labels[pattern.name] = Label(pattern.name,
-                                                     set([Source(target, -1)]))
+                mlb = MultiLabel({}, target)
                 logging.debug(f"Pseudo-initialized {target} with {mlb}")
                 new.mlabel_set(target, mlb)
 
@@ -188,6 +338,9 @@ class IFVisitor():
 
         logging.debug(f"Multilabelling after assign is {str(new)}")
 
+        # The reads of the names not assigned still hold
+        if self.reads is not None:
+            self.reads.carry(mtlb, mtlb.version, new, targets)
         return new
 
     def visit_constant(self, node: ast.Constant, policy: Policy,
@@ -201,12 +354,12 @@ class IFVisitor():
         mlb = mtlb.mlabel_of(node.id)
 
         if mlb is not None:
-            # Some variables might have markes as unitilialized. The line number
-            # should be replaced in (the vulnerability is only reported on evaluation)
-            for lbl in mlb.labels.values():
-                for val in lbl.values:
-                    if val.lineno == -1:
-                        val.lineno = node.lineno
+            # The variable might be marked as uninitialized. Its source gets
+            # the line of this read (the vulnerability is only reported on
+            # evaluation), on the path the multilabelling is of
+            if mlb.uninitialized is not None:
+                mlb = mlb.resolve(node.lineno, policy)
+                mtlb.mlabel_set(node.id, mlb)
 
             # if variable is a source for some pattern, it's always a source
             # so, the multilabel with this information must be merged with remaining information
@@ -239,20 +392,31 @@ class IFVisitor():
     def visit_if(self, node: ast.If, policy: Policy, mtlb: MultiLabelling,
                  vulns: Vulnerability) -> MultiLabelling:
 
+        truth = self.constant_truth(node.test)
+        if truth is not None:
+            # Only one branch is taken, and the condition adds nothing to the
+            # context
+            if truth:
+                return self.visit_multiple(node.body, policy, mtlb, vulns)
+            return self.visit_multiple(node.orelse, policy, mtlb, vulns)
+
         condmlb = self.visit(node.test, policy, mtlb, vulns)
 
         logging.debug(f"pushing the following context: {condmlb}")
         self.contexts.append(condmlb.clone().filter_implicit(policy))
 
+        # The first reads of the branches only resolve the uninitialized
+        # values of their own path (see `visit_name`)
+        not_taken = mtlb.clone()
         taken = self.visit_multiple(node.body, policy, mtlb, vulns)
 
         left_stop = self.stop
         self.stop = False
 
-        not_taken = mtlb
         if node.orelse:
             logging.debug("visiting orelse node")
-            not_taken = self.visit_multiple(node.orelse, policy, mtlb, vulns)
+            not_taken = self.visit_multiple(node.orelse, policy, not_taken,
+                                            vulns)
 
         right_stop = self.stop
 
@@ -267,13 +431,9 @@ class IFVisitor():
         for (a, b) in ((taken, not_taken), (not_taken, taken)):
             for var in a.mapping:
                 if var not in b.mapping:
-                    lbl = MultiLabel({})
-                    for pattern in policy.patterns:
-                        lbl.labels[pattern.name] = Label(
-                            pattern.name, set([Source(var, -1)]))
-                    b.mapping[var] = lbl
+                    b.mlabel_set(var, MultiLabel({}, var))
 
-        ans = taken.combine(not_taken)
+        ans = self.widen(taken.combine(not_taken))
 
         logging.debug(f"taken path: {taken}")
         logging.debug(f"not taken path: {not_taken}")
@@ -281,53 +441,154 @@ class IFVisitor():
 
         return ans
 
-    def visit_compare(self, node: ast.Compare, policy: Policy,
-                      mtlb: MultiLabelling,
-                      vulns: Vulnerability) -> MultiLabel:
+    def visit_expr(self, node: ast.Expr, policy: Policy, mtlb: MultiLabelling,
+                   vulns: Vulnerability) -> MultiLabel:
+        return self.visit(node.value, policy, mtlb, vulns)
 
-        aggregate: MultiLabel = self.visit(node.left, policy, mtlb, vulns)
+    def evaluate(self, node: ast.expr, policy: Policy, mtlb: MultiLabelling,
+                 vulns: Vulnerability) -> MultiLabel:
+        """
+        Evaluates an expression on an explicit stack, so its depth isn't
+        bounded by the recursion limit. The multilabels of the operands of
+        operations and attribute reads are added, in place and in order, to the
+        one being accumulated (of the whole expression or of the arguments of a
+        call), so the time is linear in the size of the expression. Calls and
+        comparisons are evaluated in order too, with their own accumulators.
+        """
+        # Multilabels being accumulated, innermost last
+        values = [MultiLabel({})]
+        work = [("eval", node, None)]
+        while work:
+            action, node, extra = work.pop()
+
+            if action == "open":
+                values.append(extra)
+
+            elif action == "call":
+                mlb = values.pop()
+                self.apply_call(node, extra, mlb, policy, vulns)
+                # Must combine with current context after complete evaluation
+                # (because sanitized results must be recombined with context,
+                # which can't be sanitized)
+                values[-1].update(mlb)
+                values[-1].update(self.current_context())
+
+            elif action == "compare":
+                operands = values[-extra:]
+                del values[-extra:]
+                aggregate = operands[0]
+                for val in operands[1:]:
+                    aggregate = val.combine(aggregate)
+                values[-1].update(aggregate)
+
+            elif type(node) in (ast.BinOp, ast.BoolOp, ast.UnaryOp):
+                if type(node) == ast.BinOp:
+                    operands = [node.left, node.right]
+                elif type(node) == ast.BoolOp:
+                    operands = node.values
+                else:
+                    operands = [node.operand]
+                for operand in reversed(operands):
+                    work.append(("eval", operand, None))
+
+            elif type(node) == ast.Name and self.reads is not None:
+                values[-1].update(self.read([node], policy, mtlb))
+
+            elif type(node) == ast.Attribute:
+                chain = IFVisitor.attribute_chain(
+                    node) if self.reads is not None else None
+                if chain is not None:
+                    values[-1].update(self.read(chain, policy, mtlb))
+                    continue
+
+                # Note that attributes are only evaluated when on the right
+                # hand side (so this is to be handled as a binary operation).
+                # The attribute is handled as a variable, through a fake Name
+                # node
+                work.append(
+                    ("eval", ast.Name(node.attr, None,
+                                      lineno=node.lineno), None))
+                work.append(("eval", node.value, None))
+
+            elif type(node) == ast.Compare:
+                operands = [node.left] + node.comparators
+                work.append(("compare", node, len(operands)))
+                for operand in reversed(operands):
+                    work.append(("eval", operand, None))
+                    work.append(("open", None, MultiLabel({})))
+
+            elif type(node) == ast.Call:
+                flat_nodes = IFVisitor.flat_vars(node)
+                if len(flat_nodes) > 1:
+                    # Turn a.b.c() into a + b + c()
+                    # (the nodes aren't dumped, as `ast.dump` recurses)
+                    logging.debug(
+                        f"Reduced call at line {node.lineno} into {len(flat_nodes)} elements"
+                    )
+                    for flat_node in reversed(flat_nodes):
+                        work.append(("eval", flat_node, None))
+                    continue
 
-        for val in node.comparators:
-            aggregate = self.visit(val, policy, mtlb, vulns).combine(aggregate)
+                # Merge all multilabels of the arguments with the context
+                name = flat_nodes[-1].func.id
+                work.append(("call", node, name))
+                for arg in reversed(node.args):
+                    work.append(("eval", arg, None))
+                work.append(("open", None, self.current_context()))
 
-        return aggregate
+            else:
+                values[-1].update(self.visit(node, policy, mtlb, vulns))
 
-    def visit_expr(self, node: ast.Expr, policy: Policy, mtlb: MultiLabelling,
-                   vulns: Vulnerability) -> MultiLabel:
-        return self.visit(node.value, policy, mtlb, vulns)
+        return values[0]
 
-    def visit_call(self, node: ast.Call, policy: Policy, mtlb: MultiLabelling,
-                   vulns: Vulnerability) -> MultiLabel:
-        flat_nodes = IFVisitor.flat_vars(node)
-
-        if len(flat_nodes) > 1:
-            # Turn a.b.c() into a + b + c()
-            # Don't recall why I did this
-            # fake_nodes.append(
-            #     ast.Call(ast.Name(name, lineno=node.lineno),
-            #              node.args,
-            #              node.keywords,
-            #              lineno=node.lineno))
-            fake_sum = functools.reduce(
-                lambda a, b: ast.BinOp(
-                    left=a, op=ast.Add(), right=b, lineno=node.lineno),
-                flat_nodes)
-            logging.debug(
-                f"Reduced {ast.dump(node)} into {list(map(ast.dump, flat_nodes))}"
-            )
-            return self.visit(fake_sum, policy, mtlb, vulns)
-
-        logging.debug(f"vars is {list(map(ast.dump, flat_nodes))}")
-        name = flat_nodes[-1].func.id
-        # Merge all multilabels of the arguments
-        mlb = self.current_context()
-        for arg in node.args:
-            argmlb = self.visit(arg, policy, mtlb, vulns)
-            logging.debug(
-                f"Argument for {name} has the following multilabel: {str(argmlb)}"
-            )
-            mlb = mlb.combine(argmlb)
+    def attribute_chain(node: ast.Attribute) -> list[ast.Name]:
+        """
+        Returns the names an attribute chain (e.g. `a.b.c`) reads, in the
+        order they are evaluated (None if it isn't made of names only)
+        """
+        chain = []
+        while type(node) == ast.Attribute:
+            # Attributes are read through a fake Name node (see `evaluate`)
+            chain.append(ast.Name(node.attr, None, lineno=node.lineno))
+            node = node.value
+        if type(node) != ast.Name:
+            return None
+        chain.append(node)
+        return chain[::-1]
+
+    def read(self, names: list[ast.Name], policy: Policy,
+             mtlb: MultiLabelling) -> MultiLabel:
+        """
+        Returns the multilabel of a name or attribute chain read by an
+        expression, memoized while the multilabelling and the context don't
+        change (see `expr_memo`). It is shared, so it must not be changed
+        """
+        # The line of a read only matters for the sources it adds (of names
+        # that are sources or aren't initialized)
+        key = tuple((name.id, name.lineno if name.id not in mtlb.mapping
+                     or policy.search_source(name.id) else None)
+                    for name in names)
+        mlb = self.reads.get(key, mtlb, self.contexts[-1], policy)
+        if mlb is not None:
+            self.stats.incr("expr_memo_hits")
+            return mlb
 
+        self.stats.incr("expr_memo_misses")
+        if len(names) == 1:
+            mlb = self.visit_name(names[0], policy, mtlb, None)
+        else:
+            mlb = MultiLabel({})
+            for name in names:
+                mlb.update(self.read([name], policy, mtlb))
+        self.reads.set(key, mlb)
+        return mlb
+
+    def apply_call(self, node: ast.Call, name: str, mlb: MultiLabel,
+                   policy: Policy, vulns: Vulnerability):
+        """
+        Applies a call to the multilabel of its arguments (in place), saving
+        the illegal flows if it is a sink
+        """
         logging.debug(f"Call for {name} has initial multilabel of {str(mlb)}")
 
         # Patterns for which name is a source - add new source to that label
@@ -345,7 +606,11 @@ class IFVisitor():
         for pattern in sanitizers:
             logging.debug(f"{name} is a sanitizer for {str(pattern)}")
             lbl = mlb.get_label(pattern.name)
-            lbl.add_sanitizer(Element(name, node.lineno))
+            if self.options.sanitized_flows:
+                lbl.add_sanitizer(Element(name, node.lineno),
+                                  self.options.max_path_length)
+            else:
+                lbl.values = set()
 
         # Patterns for which name is a sink - check is there's any violation
         bad_labels = policy.find_illegal(name, mlb)
@@ -355,30 +620,100 @@ class IFVisitor():
 
         logging.debug(f"Call for {name} has final multilabel of {str(mlb)}")
 
-        # Must combine with current context after complete evaluation
-        # (because sanitized results must be recombined with context, which
-        # can't be sanitized)
-        return mlb.combine(self.current_context())
+    def constant_truth(self, test: ast.AST) -> bool:
+        """
+        Returns the truth value of a condition, if it is constant and constant
+        conditions are pruned (see `dataflow.constant_truth`)
+        """
+        if not self.options.prune_constants:
+            return None
+        truth = dataflow.constant_truth(test)
+        if truth is not None:
+            self.stats.incr("constant_conditions")
+        return truth
 
     def visit_while(self, node: ast.While, policy: Policy,
                     mtlb: MultiLabelling,
                     vulns: Vulnerability) -> MultiLabelling:
 
+        truth = self.constant_truth(node.test)
+        if truth == False:
+            return mtlb
+
+        result = self.memo_while(node, policy, mtlb, vulns)
+
+        # Loops whose condition always holds are only left by breaking out of
+        # them, so without breaks the code after them is unreachable
+        if truth and not dataflow.breaks_out(node.body):
+            self.stop = True
+        return result
+
+    def memo_while(self, node: ast.While, policy: Policy, mtlb: MultiLabelling,
+                   vulns: Vulnerability) -> MultiLabelling:
+
+        # Loops leave their context when there are termination leaks, and
+        # the analysis is partial once a budget is exceeded, so the summaries
+        # wouldn't be complete
+        if (not self.options.loop_memo or self.options.termination_leak
+                or self.degraded or self.aborted):
+            return self.iterate_while(node, policy, mtlb, vulns)
+
+        if node not in self.loop_names:
+            self.loop_names[node] = tuple(sorted(dataflow.names_in(node)))
+        names = self.loop_names[node]
+
+        # Nested loops are analysed on every iteration of the enclosing ones,
+        # often with the same input
+        key = (node, policy, fingerprint(names, mtlb, self.contexts[-1]))
+        summary = self.loop_summaries.get(key)
+        if summary is not None:
+            self.stats.incr("loop_memo_hits")
+            return summary.replay(mtlb, vulns)
+
+        self.stats.incr("loop_memo_misses")
+        recorder = Recorder(vulns)
+        result = self.iterate_while(node, policy, mtlb, recorder)
+
+        if not (self.degraded or self.aborted):
+            self.loop_summaries[key] = LoopSummary(set(names), result,
+                                                   recorder.saved)
+        return result
+
+    def iterate_while(self, node: ast.While, policy: Policy,
+                      mtlb: MultiLabelling,
+                      vulns: Vulnerability) -> MultiLabelling:
+
         condmlb = self.visit(node.test, policy, mtlb, vulns)
-        self.contexts.append(condmlb.clone().filter_implicit(policy))
+        context = condmlb.clone().filter_implicit(policy)
+        self.contexts.append(context)
+        self.loop_depth += 1
 
         aggregate_cond_mlb = condmlb
         old_mtlb = None
+        old_context = None
         i = 0
         logging.debug(f"(start) Multilabelling is {mtlb}")
-        # Uses fixed point algorithm (i.e. waits for fixed point)
-        while old_mtlb != mtlb:
-            old_mtlb = mtlb.clone()
+        # Uses fixed point algorithm (i.e. waits for fixed point). The context
+        # is part of it, since each iteration is analysed in the context of the
+        # condition of the previous one
+        while old_mtlb != mtlb or old_context != context:
+            if i > 0 and (self.degraded or self.aborted):
+                logging.debug(f"stopped iterating loop (budget exceeded)")
+                break
 
-            taken = self.visit_multiple(node.body, policy, mtlb, vulns)
-            self.stop = False
+            old_mtlb = mtlb.clone()
+            old_context = context
+            self.stats.incr("iterations")
+            if self.memory is not None:
+                mark = self.memory.mark(mtlb)
+
+            # The flows saved by the iteration are the ones the closure starts
+            # from
+            body_vulns = Recorder(vulns) if self.closes() else vulns
             # TODO: handle orelse (a bit akward in while context)
-            not_taken = mtlb
+            not_taken = mtlb.clone()
+            taken = self.visit_multiple(node.body, policy, mtlb, body_vulns)
+            self.stop = False
 
             # all variables defined in multilabelling from one branch and not the other
             # should be added to the branches multilabelling with the initial value (as if evaluated
@@ -387,72 +722,82 @@ class IFVisitor():
             for (a, b) in ((taken, not_taken), (not_taken, taken)):
                 for var in a.mapping:
                     if var not in b.mapping:
-                        lbl = MultiLabel({})
-                        for pattern in policy.patterns:
-                            lbl.labels[pattern.name] = Label(
-                                pattern.name, set([Source(var, -1)]))
-                        b.mapping[var] = lbl
+                        b.mlabel_set(var, MultiLabel({}, var))
 
-            mtlb = taken.combine(not_taken)
+            mtlb = self.widen(taken.combine(not_taken))
             logging.debug(f"(i={i}) Multilabelling is {mtlb}")
+            if self.memory is not None:
+                self.memory.record(node.lineno, "iteration", mark, mtlb)
 
             condmlb = self.visit(node.test, policy, mtlb, vulns)
             aggregate_cond_mlb = aggregate_cond_mlb.combine(condmlb)
             i += 1
-            self.contexts.append(condmlb.clone().filter_implicit(policy))
+            context = condmlb.clone().filter_implicit(policy)
+            self.contexts.append(context)
+
+            closure = self.closure_of(node, policy)
+            if body_vulns is not vulns and closure is not None and (
+                    old_mtlb != mtlb or old_context != context):
+                closed = closure.close(old_mtlb, mtlb, old_context, context,
+                                       body_vulns.saved,
+                                       self.live.get(closure.summary.last),
+                                       policy, vulns, self.options)
+                if closed is not None:
+                    mtlb, levels = closed
+                    logging.debug(
+                        f"(i={i}) Closed loop in {levels} levels, multilabelling is {mtlb}"
+                    )
+                    self.stats.incr("loop_closures")
+                    self.stats.incr("loop_closure_levels", levels)
+                    break
 
         logging.debug(f"parsing while stopped after {i} iterations")
+        self.loop_depth -= 1
         for _ in range(i + 1):
             self.contexts.pop()
 
         # leave as context the aggregate multilabel (encodes all possible values
         # that were in the condition and that taint everything because of loop termination)
-        if TERMINATION_LEAK:
+        if self.options.termination_leak:
             self.contexts.append(aggregate_cond_mlb.filter_implicit(policy))
 
         return mtlb
 
-    def visit_bin_op(self, node: ast.BinOp, policy: Policy,
-                     mtlb: MultiLabelling, vulns: Vulnerability) -> MultiLabel:
-
-        left = self.visit(node.left, policy, mtlb, vulns)
-        logging.debug(f"left of binary node: {str(left)}")
-        right = self.visit(node.right, policy, mtlb, vulns)
-        logging.debug(f"right of binary node: {str(right)}")
-
-        return left.combine(right)
-
-    def visit_attribute(self, node: ast.Attribute, policy: Policy,
-                        mtlb: MultiLabelling,
-                        vulns: Vulnerability) -> MultiLabel:
-
-        # Note that this method is only called when attribute is on the right
-        # hand side (so this is to be handled as a binary operation)
-
-        value_lbl = self.visit(node.value, policy, mtlb, vulns)
-        logging.debug(f"value of attribute node: {str(value_lbl)}")
-
-        # I want to handle the attribute as variable, so instead of copying code,
-        # create a fake Name node
-        fake_node = ast.Name(node.attr, None)
-        attr_lbl = self.visit(fake_node, policy, mtlb, vulns)
-        logging.debug(f"attr of attribute node: {str(attr_lbl)}")
-
-        return value_lbl.combine(attr_lbl)
-
-    def visit_unary_op(self, node: ast.UnaryOp, policy: Policy,
-                       mtlb: MultiLabelling,
-                       vulns: Vulnerability) -> MultiLabel:
-
-        return self.visit(node.operand, policy, mtlb, vulns)
+    def closes(self) -> bool:
+        """
+        Whether loops may be closed (see `loop_closure`): they are iterated
+        up to their fixed point with block summaries, and their conditions
+        don't leak after them
+        """
+        options = self.options
+        return options.loop_closure and options.block_summaries and not (
+            options.has_budget() or options.termination_leak or self.degraded
+            or self.aborted)
 
-    def visit_bool_op(self, node: ast.BoolOp, policy: Policy,
-                      mtlb: MultiLabelling,
-                      vulns: Vulnerability) -> MultiLabel:
+    def prunes(self) -> bool:
+        """
+        Whether dead names are removed from the multilabellings (see
+        `dataflow.liveness`): as with loop closures, only while the analysis is
+        unbounded and the conditions of loops don't leak after them (budgets
+        are checked against the size of the state)
+        """
+        options = self.options
+        return options.liveness and not (options.has_budget()
+                                         or options.termination_leak
+                                         or self.degraded or self.aborted)
 
-        return functools.reduce(
-            lambda a, b: a.combine(b),
-            map(lambda n: self.visit(n, policy, mtlb, vulns), node.values))
+    def closure_of(self, node: ast.While, policy: Policy) -> LoopClosure:
+        """
+        Returns the flow graph of a loop whose body is a single block (None
+        otherwise, or if its body wasn't summarized yet)
+        """
+        key = (node, policy)
+        if key not in self.closures:
+            if (node.body[0], policy) not in self.blocks:
+                return None
+            summary, length = self.blocks[(node.body[0], policy)]
+            self.closures[key] = LoopClosure.of(node, summary, length)
+        return self.closures[key]
 
     def visit_pass(self, node: ast.UnaryOp, policy: Policy,
                    mtlb: MultiLabelling,
@@ -496,6 +841,11 @@ class IFVisitor():
         #   target = iter
         #   body
 
+        # The conversion is done once for each loop, so that the summaries of
+        # the while loop (see `visit_while`) are reused
+        if node in self.lowered:
+            return self.visit(self.lowered[node], policy, mtlb, vulns)
+
         test_node = ast.UnaryOp(op=ast.Not(),
                                 operand=node.iter,
                                 lineno=node.iter.lineno)
@@ -504,19 +854,23 @@ class IFVisitor():
                                  lineno=node.iter.lineno)
         body_node = [assign_node] + node.body
 
-        while_node = ast.While(test=test_node, body=body_node)
+        while_node = ast.While(test=test_node,
+                               body=body_node,
+                               lineno=node.lineno)
 
         logging.debug(
-            f"Converted {ast.dump(node)} into {ast.dump(while_node)}")
+            f"Converted for loop at line {node.lineno} into a while loop")
+        self.lowered[node] = while_node
 
         return self.visit(while_node, policy, mtlb, vulns)
 
-    def visit_continue(self, node: ast.For, policy: Policy, mtlb: MultiLabelling,
-                  vulns: Vulnerability) -> MultiLabelling:
+    def visit_continue(self, node: ast.For, policy: Policy,
+                       mtlb: MultiLabelling,
+                       vulns: Vulnerability) -> MultiLabelling:
         self.stop = True
         return mtlb
 
     def visit_break(self, node: ast.For, policy: Policy, mtlb: MultiLabelling,
-                  vulns: Vulnerability) -> MultiLabelling:
+                    vulns: Vulnerability) -> MultiLabelling:
         self.stop = True
         return mtlb
@@ -0,0 +1,120 @@
+from __future__ import annotations
+import ast
+from flow_follow import Pattern, Policy, Vulnerability
+from options import Options
+from stats import Stats
+from ast_cache import ASTCache, Parsed
+import py_analyser
+
+
+class Finding:
+    """
+    An illegal flow from a source to a sink (an entry of the output of the
+    analysis, see `Vulnerability.findings_to_list`)
+    """
+
+    def __init__(self, vulnerability: str, pattern: str,
+                 source: tuple[str, int], sink: tuple[str, int],
+                 sanitized_flows: list[list[tuple[str, int]]],
+                 unsanitized: bool, approximated: bool):
+        # Name of the finding (the pattern, numbered) and of its pattern
+        self.vulnerability = vulnerability
+        self.pattern = pattern
+
+        # Name and line of the source and of the sink
+        self.source = source
+        self.sink = sink
+
+        # Sanitizers (name and line) of each sanitized flow, in order, and
+        # whether some flow is unsanitized
+        self.sanitized_flows = sanitized_flows
+        self.unsanitized = unsanitized
+
+        # Whether some sanitized flow is a summary (see `WidenedPath`)
+        self.approximated = approximated
+
+    def __repr__(self) -> str:
+        return f"Finding[{self.vulnerability}] {{ {self.source[0]}@{self.source[1]} -> {self.sink[0]}@{self.sink[1]} }}"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Finding):
+            return False
+        return vars(self) == vars(other)
+
+
+class Result:
+    """
+    The findings of the analysis of a slice, in the order they are reported,
+    and the statistics of the analysis
+    """
+
+    def __init__(self, findings: dict[tuple, tuple[list, bool]], stats: Stats):
+        # As returned by `Vulnerability.findings`
+        self.raw = findings
+        self.stats = stats
+
+        # Whether a budget was exceeded (so there might be more findings)
+        self.partial = stats.budget_exceeded is not None
+
+        self.findings = []
+        for key, entry in zip(findings,
+                              Vulnerability.findings_to_list(findings)):
+            self.findings.append(
+                Finding(entry["vulnerability"], key[2], tuple(entry["source"]),
+                        tuple(entry["sink"]),
+                        [[tuple(san) for san in flow]
+                         for flow in entry["sanitized_flows"]],
+                        entry["unsanitized_flows"] == "yes",
+                        entry.get("approximated") == "yes"))
+
+    def __iter__(self):
+        return iter(self.findings)
+
+    def __len__(self) -> int:
+        return len(self.findings)
+
+    def __repr__(self) -> str:
+        return f"Result {{ {self.findings} }}"
+
+    def to_list(self) -> list[dict]:
+        return Vulnerability.findings_to_list(self.raw)
+
+    def to_json(self) -> str:
+        """
+        Returns the output of the analysis (as printed by `py_analyser.py`)
+        """
+        return Vulnerability.findings_to_json(self.raw)
+
+
+def compile_policy(patterns: list[dict] | str) -> Policy:
+    """
+    Returns the policy of the given patterns (as in a patterns file) or of
+    the patterns file with the given name. Policies aren't changed by the
+    analysis, so one can be used by any number of (concurrent) analyses.
+    """
+    if type(patterns) == str:
+        return py_analyser.load_policy(patterns)
+    return Policy([Pattern.from_json(pattern) for pattern in patterns])
+
+
+def analyse(code: str | bytes | ast.Module,
+            policy: Policy,
+            options: Options = None,
+            cache: ASTCache = None) -> Result:
+    """
+    Analyses a slice, given its source code or its (parsed) tree, and returns
+    its findings. There is no state shared between calls (nothing is printed
+    or logged to a file either), so it can be called from several threads at
+    once. Slices given as source code are parsed through the cache, if given.
+    """
+    if options is None:
+        options = Options()
+
+    if type(code) == ast.Module:
+        findings, stats = py_analyser.analyse_parsed(Parsed(code), policy,
+                                                     options)
+    else:
+        if type(code) == str:
+            code = code.encode("utf-8")
+        findings, stats = py_analyser.analyse(code, policy, options, cache)
+    return Result(findings, stats)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+import ast, hashlib, sys
+from disk_cache import DiskCache
+from relevance import sink_candidates
+from slicing import count_statements
+
+# Changes whenever the content of the entries changes
+CACHE_VERSION = 1
+
+# Position attributes that the analysis doesn't use (only `lineno` is used)
+UNUSED_ATTRIBUTES = ("col_offset", "end_lineno", "end_col_offset")
+
+
+class Parsed:
+    """
+    A parsed slice, with what the analysis computes from it whatever the
+    policy: the names that might be sinks (see `relevance.sink_candidates`)
+    and the number of statements
+    """
+
+    def __init__(self, tree: ast.Module):
+        self.tree = tree
+        self.candidates = sink_candidates(tree)
+        self.statements = count_statements(tree)
+
+
+def strip(tree: ast.AST) -> ast.AST:
+    """
+    Removes (in place) the attributes that the analysis doesn't use, which
+    makes entries smaller and faster to load
+    """
+    for node in ast.walk(tree):
+        for attribute in UNUSED_ATTRIBUTES:
+            if attribute in node.__dict__:
+                delattr(node, attribute)
+    return tree
+
+
+class ASTCache(DiskCache):
+    """
+    On-disk cache of parsed slices (see `Parsed`), keyed by the hash of the
+    source code and the python version (the AST depends on it)
+    """
+
+    name = "AST cache"
+
+    def from_options(options) -> ASTCache:
+        """
+        Returns the cache set by the options (None if there is none)
+        """
+        if options.ast_cache is None:
+            return None
+        return ASTCache(options.ast_cache, options.ast_cache_size * 2**20)
+
+    def key(self, source: bytes) -> str:
+        digest = hashlib.sha256(source)
+        digest.update(
+            f"{sys.implementation.cache_tag}/{CACHE_VERSION}".encode())
+        return digest.hexdigest()
+
+    def parse(self, source: bytes) -> tuple[Parsed, bool]:
+        """
+        Returns the parsed slice, and whether it was found in the cache
+        """
+        key = self.key(source)
+        parsed = self.load(key)
+        if parsed is not None:
+            return parsed, True
+
+        parsed = Parsed(strip(ast.parse(source)))
+        self.store(key, parsed)
+        return parsed, False
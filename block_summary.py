@@ -0,0 +1,389 @@
+from __future__ import annotations
+import ast, logging
+from flow_follow import *
+import IFVisitor as ifv
+from options import Options
+
+# Statements that can be part of a block (straight-line code)
+STRAIGHT_LINE = (ast.Assign, ast.AugAssign, ast.Expr, ast.Pass)
+
+# Origin of the flows of the context (see `BlockSummary`)
+CONTEXT = ("context", )
+
+
+class BlockSummary:
+    """
+    The effect of a block of straight-line code on the multilabelling, in
+    terms of the multilabelling before it. Values (of the names assigned and of
+    the sinks reached) are sets of terms `(origin, steps)`, where the origin is
+    either:
+        - ("name", name, lineno): the multilabel of the name before the block
+          (or, if it had none, a source for every pattern at `lineno`, or its
+          uninitialized value if `lineno` is -1)
+        - ("source", name, lineno, patterns): a source of the given patterns
+        - CONTEXT: the context the block is analysed in
+    and the steps are the sanitizers (name, lineno, patterns) applied to it,
+    in order. Summaries compose (see `then`), so a block is summarized once
+    and then applied as a whole (see `apply`) every time it is analysed.
+    """
+
+    def __init__(self, values: dict[str, dict], sinks: list[tuple[Element,
+                                                                  dict]],
+                 patches: dict[str, tuple[int, bool]], replaces: bool,
+                 last: ast.stmt):
+        # Maps each name assigned to its value
+        self.values = values
+
+        # Calls and assignments (in order) and their value, which is only
+        # kept for sinks (the others are saved without flows, which keeps the
+        # order in which sinks are reached, see `parallel.merge`)
+        self.sinks = sinks
+
+        # Maps each name read from the multilabelling before the block to the
+        # line of its first read, which its uninitialized value gets (see
+        # `MultiLabel.resolve`), and whether that read happens before the
+        # block replaces the multilabelling
+        self.patches = patches
+
+        # Whether the block replaces the multilabelling (i.e. assigns names),
+        # and the last statement that does so
+        self.replaces = replaces
+        self.last = last
+
+    def substitute(self, value: dict) -> dict:
+        """
+        Returns a value of the block that follows this one in terms of the
+        multilabelling before this one
+        """
+        result = {}
+        for origin, steps in value:
+            if origin[0] != "name" or origin[1] not in self.values:
+                result[(origin, steps)] = None
+                continue
+
+            name, lineno = origin[1], origin[2]
+            for (inner, inner_steps) in self.values[name]:
+                # The uninitialized values of the name keep the line of their
+                # first read
+                if inner[0] == "name" and inner[1] == name and inner[2] == -1:
+                    inner = ("name", name, lineno)
+                result[(inner, inner_steps + steps)] = None
+        return result
+
+    def then(self, other: BlockSummary) -> BlockSummary:
+        """
+        Returns the summary of this block followed by another one
+        """
+        # The first read of a name by the other block resolves the
+        # uninitialized value this one might give it (see `MultiLabel.resolve`)
+        values = dict(self.values)
+        for name, (lineno, _) in other.patches.items():
+            if name in values:
+                marker, read = ("name", name, -1), ("name", name, lineno)
+                values[name] = {
+                    (read if origin == marker else origin, steps): None
+                    for origin, steps in values[name]
+                }
+        first = BlockSummary(values, self.sinks, self.patches, self.replaces,
+                             self.last)
+
+        values = dict(first.values)
+        for name in other.values:
+            values[name] = first.substitute(other.values[name])
+
+        sinks = self.sinks + [
+            (sink, value if value is None else first.substitute(value))
+            for sink, value in other.sinks
+        ]
+
+        patches = dict(self.patches)
+        for name, (lineno, before) in other.patches.items():
+            # Names assigned by this block are only read from the
+            # multilabelling before it if they were added to
+            if name in patches or (name in self.values and not any(
+                    origin[:2] == ("name", name)
+                    for origin, _ in self.values[name])):
+                continue
+            patches[name] = (lineno, before and not self.replaces)
+
+        return BlockSummary(values, sinks, patches, self.replaces
+                            or other.replaces,
+                            other.last if other.replaces else self.last)
+
+    def apply(self, mtlb: MultiLabelling, context: MultiLabel, policy: Policy,
+              vulns: Vulnerability, options: Options) -> MultiLabelling:
+        """
+        Returns the multilabelling after the block, saving the illegal flows
+        that reach its sinks
+        """
+        for name, (lineno, before) in self.patches.items():
+            if before and name in mtlb.mapping:
+                mtlb.mlabel_set(name,
+                                mtlb.mapping[name].resolve(lineno, policy))
+
+        if not self.replaces:
+            new = mtlb
+        else:
+            new = mtlb.clone()
+            for name, (lineno, before) in self.patches.items():
+                if not before and name in new.mapping:
+                    new.mlabel_set(name,
+                                   new.mapping[name].resolve(lineno, policy))
+
+        evaluator = Evaluator(new, context, policy, options)
+        for sink, value in self.sinks:
+            if value is None:
+                vulns.save(sink, MultiLabel({}))
+            else:
+                vulns.save(
+                    sink,
+                    policy.find_illegal(sink.name, evaluator.evaluate(value)))
+
+        # All values are evaluated before any of them is assigned, as they
+        # refer to the multilabelling before the block
+        values = {
+            name: evaluator.evaluate(value)
+            for name, value in self.values.items()
+        }
+        for name, mlb in values.items():
+            new.mlabel_set(name, mlb)
+        return new
+
+
+def sanitize(flows: dict[str, set[Element]], step: tuple,
+             options: Options) -> dict[str, set[Element]]:
+    """
+    Returns the flows (by pattern) after a step (see `BlockSummary`)
+    """
+    flows = dict(flows)
+    name, lineno, patterns = step
+    for pattern in patterns:
+        if pattern not in flows:
+            continue
+        if not options.sanitized_flows:
+            flows[pattern] = set()
+            continue
+        lbl = Label(pattern, set(flows[pattern]))
+        lbl.add_sanitizer(Element(name, lineno), options.max_path_length)
+        flows[pattern] = lbl.values
+    return flows
+
+
+class Evaluator:
+    """
+    Evaluates the values of a summary (see `BlockSummary`) against the
+    multilabelling before the block. Terms that share an origin and a prefix
+    of their steps share its evaluation.
+    """
+
+    def __init__(self, mtlb: MultiLabelling, context: MultiLabel,
+                 policy: Policy, options: Options):
+        self.mtlb = mtlb
+        self.context = context
+        self.policy = policy
+        self.options = options
+        # Maps each term to its flows, by pattern
+        self.cache = {}
+
+    def origin(self, origin: tuple) -> dict[str, set[Element]]:
+        if origin == CONTEXT:
+            return {
+                pattern: lbl.values
+                for pattern, lbl in self.context.labels.items()
+            }
+        elif origin[0] == "source":
+            _, name, lineno, patterns = origin
+            return {pattern: {Source(name, lineno)} for pattern in patterns}
+
+        _, name, lineno = origin
+        mlb = self.mtlb.mlabel_of(name)
+        if mlb is not None:
+            return {pattern: lbl.values for pattern, lbl in mlb.labels.items()}
+        elif lineno == -1:
+            # Only its uninitialized value (see `uninitialized`)
+            return {}
+        return {
+            pattern.name: {Source(name, lineno)}
+            for pattern in self.policy.patterns
+        }
+
+    def uninitialized(self, origin: tuple) -> str:
+        """
+        Returns the name whose uninitialized value an origin has, if any: the
+        one of a name that isn't read (which keeps it unresolved)
+        """
+        if origin[0] != "name":
+            return None
+        _, name, lineno = origin
+        mlb = self.mtlb.mlabel_of(name)
+        if mlb is not None:
+            return mlb.uninitialized
+        return name if lineno == -1 else None
+
+    def term(self, origin: tuple, steps: tuple) -> dict[str, set[Element]]:
+        key = (origin, steps)
+        if key in self.cache:
+            return self.cache[key]
+
+        if len(steps) == 0:
+            flows = self.origin(origin)
+        else:
+            flows = sanitize(self.term(origin, steps[:-1]), steps[-1],
+                             self.options)
+
+        self.cache[key] = flows
+        return flows
+
+    def evaluate(self, value: dict) -> MultiLabel:
+        mlb = MultiLabel({})
+        for origin, steps in value:
+            for pattern, values in self.term(origin, steps).items():
+                mlb.get_label(pattern).values.update(values)
+            if mlb.uninitialized is None and not steps:
+                mlb.uninitialized = self.uninitialized(origin)
+        return mlb
+
+
+def summarize_statement(stmt: ast.stmt, policy: Policy) -> BlockSummary:
+    """
+    Returns the summary of a statement, mirroring its analysis by
+    `IFVisitor` (raises ValueError for the expressions it doesn't summarize)
+    """
+    sinks = []
+    patches = {}
+
+    def read(name: str, lineno: int) -> dict:
+        patches.setdefault(name, (lineno, True))
+        value = {(("name", name, lineno), ()): None}
+        sources = policy.search_source(name)
+        if sources:
+            value[(("source", name, lineno, tuple(sources)), ())] = None
+        value[(CONTEXT, ())] = None
+        return value
+
+    def call(node: ast.Call) -> dict:
+        if type(node.func) != ast.Name:
+            raise ValueError(f"call of {type(node.func).__name__}")
+        name = node.func.id
+
+        value = {(CONTEXT, ()): None}
+        for arg in node.args:
+            value.update(expression(arg))
+
+        sources = policy.search_source(name)
+        if sources:
+            value[(("source", name, node.lineno, tuple(sources)), ())] = None
+
+        sanitizers = policy.search_sanitizer(name)
+        if sanitizers:
+            step = (name, node.lineno, tuple(sanitizers))
+            value = {
+                (origin, steps + (step, )): None
+                for origin, steps in value
+            }
+
+        sinks.append((Element(name, node.lineno),
+                      value if policy.search_sink(name) else None))
+
+        value = dict(value)
+        value[(CONTEXT, ())] = None
+        return value
+
+    def expression(node: ast.AST) -> dict:
+        # Operands are summarized in order on an explicit stack, so deep
+        # expressions don't recurse (see `IFVisitor.evaluate`)
+        value = {}
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if type(node) == ast.Constant:
+                value[(CONTEXT, ())] = None
+            elif type(node) == ast.Name:
+                value.update(read(node.id, node.lineno))
+            elif type(node) == ast.Call:
+                try:
+                    flat_nodes = ifv.IFVisitor.flat_vars(node)
+                except AssertionError:
+                    raise ValueError("call of a non attribute chain")
+                # Chains are evaluated as the combination of their elements
+                # (see `IFVisitor.evaluate`)
+                for flat_node in flat_nodes:
+                    value.update(
+                        read(flat_node.id, flat_node.lineno)
+                        if type(flat_node) == ast.Name else call(flat_node))
+            elif type(node) == ast.BinOp:
+                stack += [node.right, node.left]
+            elif type(node) == ast.UnaryOp:
+                stack.append(node.operand)
+            elif type(node) in (ast.BoolOp, ast.Compare):
+                operands = node.values if type(
+                    node) == ast.BoolOp else [node.left] + node.comparators
+                stack += reversed(operands)
+            else:
+                raise ValueError(f"expression {type(node).__name__}")
+        return value
+
+    values = {}
+    if type(stmt) == ast.Expr:
+        expression(stmt.value)
+    elif type(stmt) in (ast.Assign, ast.AugAssign):
+        if type(stmt) == ast.Assign:
+            targets = stmt.targets
+            value = expression(stmt.value)
+        else:
+            targets = [stmt.target]
+            value = {**expression(stmt.value), **expression(stmt.target)}
+
+        left_targets = []
+        rightmost_targets = []
+        for target in targets:
+            try:
+                flattened = [
+                    flat_node.id
+                    for flat_node in ifv.IFVisitor.flat_vars(target)
+                    if type(flat_node) == ast.Name
+                ]
+            except AssertionError:
+                raise ValueError(f"assignment to {type(target).__name__}")
+            left_targets += flattened[:-1]
+            rightmost_targets.append(flattened[-1])
+
+        # The names on the left of the rightmost one are added to (see
+        # `IFVisitor.visit_assign`)
+        for target in left_targets:
+            values.setdefault(target, {(("name", target, -1), ()): None})
+            values[target].update(value)
+        for target in rightmost_targets:
+            values[target] = dict(value)
+
+        for target in left_targets + rightmost_targets:
+            sinks.append((Element(target, stmt.lineno),
+                          value if policy.search_sink(target) else None))
+
+    replaces = type(stmt) in (ast.Assign, ast.AugAssign)
+    return BlockSummary(values, sinks, patches, replaces,
+                        stmt if replaces else None)
+
+
+def summarize(stmts: list[ast.stmt],
+              policy: Policy) -> tuple[BlockSummary, int]:
+    """
+    Returns the summary of the longest block of straight-line code at the
+    start of the statements, and its length (None and 0 if the first
+    statement can't be summarized)
+    """
+    summary = None
+    length = 0
+    for stmt in stmts:
+        if type(stmt) not in STRAIGHT_LINE:
+            break
+        try:
+            stmt_summary = summarize_statement(stmt, policy)
+        except ValueError as e:
+            logging.debug(f"Not summarizing line {stmt.lineno}: {e}")
+            break
+
+        summary = stmt_summary if summary is None else summary.then(
+            stmt_summary)
+        length += 1
+    return summary, length
@@ -0,0 +1,212 @@
+from __future__ import annotations
+import ast
+
+
+def names_in(node: ast.AST) -> set[str]:
+    """
+    Returns the names that occur in a node: variables and attributes (the
+    visitor evaluates `a.b` as the combination of variables `a` and `b`)
+    """
+    names = set()
+    if node is None:
+        return names
+
+    for el in ast.walk(node):
+        if type(el) == ast.Name:
+            names.add(el.id)
+        elif type(el) == ast.Attribute:
+            names.add(el.attr)
+    return names
+
+
+def called_in(node: ast.AST) -> set[str]:
+    """
+    Returns the names of the functions called in a node
+    """
+    names = set()
+    if node is None:
+        return names
+
+    for el in ast.walk(node):
+        if type(el) == ast.Call:
+            if type(el.func) == ast.Name:
+                names.add(el.func.id)
+            elif type(el.func) == ast.Attribute:
+                names.add(el.func.attr)
+    return names
+
+
+def targets_of(stmt: ast.stmt) -> list[ast.AST]:
+    """
+    Returns the assignment targets of a statement
+    """
+    if type(stmt) == ast.Assign:
+        return stmt.targets
+    elif type(stmt) in (ast.AugAssign, ast.For):
+        return [stmt.target]
+    return []
+
+
+def header_of(stmt: ast.stmt) -> ast.AST:
+    """
+    Returns the expression evaluated by a statement (for compound statements,
+    the one evaluated before entering the body)
+    """
+    if type(stmt) in (ast.If, ast.While):
+        return stmt.test
+    elif type(stmt) == ast.For:
+        return stmt.iter
+    elif type(stmt) in (ast.Assign, ast.AugAssign, ast.Expr):
+        return stmt.value
+    return None
+
+
+def defs(stmt: ast.stmt) -> set[str]:
+    """
+    Returns the names (possibly) assigned by a statement, not including the
+    ones assigned in its body
+    """
+    names = set()
+    for target in targets_of(stmt):
+        names |= names_in(target)
+    return names
+
+
+def kills(stmt: ast.stmt) -> set[str]:
+    """
+    Returns the names whose multilabel is replaced by a statement: the
+    rightmost name of each target (the other ones are only added to)
+    """
+    names = set()
+    for target in targets_of(stmt):
+        if type(target) == ast.Name:
+            names.add(target.id)
+        elif type(target) == ast.Attribute:
+            names.add(target.attr)
+    return names
+
+
+def uses(stmt: ast.stmt) -> set[str]:
+    """
+    Returns (an over approximation of) the names read by a statement, not
+    including the ones read in its body
+    """
+    names = names_in(header_of(stmt))
+    for target in targets_of(stmt):
+        # Only a plain name is not read when assigned to (in `a.b = x`, the
+        # label of `x` is added to the one of `a`)
+        if type(target) != ast.Name or type(stmt) == ast.AugAssign:
+            names |= names_in(target)
+    return names
+
+
+def blocks_of(stmt: ast.stmt) -> list[list[ast.stmt]]:
+    """
+    Returns the blocks of statements nested in a compound statement
+    """
+    if type(stmt) == ast.If:
+        return [stmt.body, stmt.orelse]
+    elif type(stmt) in (ast.While, ast.For):
+        # The orelse of loops is not analysed
+        return [stmt.body]
+    return []
+
+
+def is_loop(stmt: ast.stmt) -> bool:
+    return type(stmt) in (ast.While, ast.For)
+
+
+def constant_truth(test: ast.AST) -> bool:
+    """
+    Returns the truth value of a condition made of constants (and `not`,
+    `and` and `or` of them), or None if it isn't constant. Operands that
+    aren't evaluated (because of short circuiting) don't need to be constant
+    """
+    if type(test) == ast.Constant:
+        return bool(test.value)
+    elif type(test) == ast.UnaryOp and type(test.op) == ast.Not:
+        truth = constant_truth(test.operand)
+        return None if truth is None else not truth
+    elif type(test) == ast.BoolOp:
+        # The value that decides `and` (or `or`)
+        decides = type(test.op) == ast.Or
+        for value in test.values:
+            truth = constant_truth(value)
+            if truth is None:
+                return None
+            if truth == decides:
+                return truth
+        return not decides
+    return None
+
+
+def breaks_out(stmts: list[ast.stmt]) -> bool:
+    """
+    Returns whether a loop body may break out of the loop (breaks of nested
+    loops only leave those)
+    """
+    for stmt in stmts:
+        if type(stmt) == ast.Break:
+            return True
+        elif type(stmt) == ast.If and (breaks_out(stmt.body)
+                                       or breaks_out(stmt.orelse)):
+            return True
+    return False
+
+
+def may_jump(stmt: ast.stmt) -> bool:
+    """
+    Returns whether the analysis of a statement may stop at a jump to the
+    head of the innermost loop: a break or continue (in the statement or in
+    the branches of its ifs), or a loop whose condition always holds and
+    that doesn't break out (see `IFVisitor.visit_while`)
+    """
+    if type(stmt) in (ast.Break, ast.Continue):
+        return True
+    elif type(stmt) == ast.If:
+        return any(may_jump(nested) for nested in stmt.body + stmt.orelse)
+    elif type(stmt) == ast.While:
+        return constant_truth(stmt.test) == True and not breaks_out(stmt.body)
+    return False
+
+
+def liveness(
+    stmts: list[ast.stmt],
+    live: set[str],
+    table: dict[ast.stmt, set[str]],
+    loop: set[str] = frozenset()) -> set[str]:
+    """
+    Backward liveness analysis of a block. Receives the names live after the
+    block and returns the ones live before it, recording in `table` the names
+    live after each statement. `loop` are the names live where jumps go to:
+    the head of the innermost loop and, since the analysis skips the rest of
+    the blocks a jump is in and lets it fall through, the end of each of them
+    up to the loop. The multilabelling after a statement that may jump is also
+    the one at the jump, so those names are live after it too.
+    """
+    for stmt in reversed(stmts):
+        table[stmt] = live | loop if may_jump(stmt) else live
+
+        if type(stmt) == ast.If:
+            jumps = loop | live
+            live = liveness(stmt.body, live, table, jumps) | liveness(
+                stmt.orelse, live, table, jumps) | names_in(stmt.test)
+
+        elif is_loop(stmt):
+            # The names live at the head of the loop, up to a fixed point
+            head = live | uses(stmt)
+            while True:
+                body = liveness(stmt.body, head, table, head)
+                new = live | uses(stmt) | (body - kills(stmt))
+                if new == head:
+                    break
+                head = new
+            live = head
+
+        elif type(stmt) in (ast.Break, ast.Continue):
+            live = live | loop
+
+        else:
+            live = (live - kills(stmt)) | uses(stmt)
+
+    return live
@@ -0,0 +1,117 @@
+from __future__ import annotations
+import logging, os, pickle, tempfile
+
+
+class DiskCache:
+    """
+    On-disk cache of pickled entries, one file each named after its key
+    (computed by the subclasses). The least recently used entries are removed
+    when the cache grows over `max_size` bytes. Several processes can share
+    the same directory.
+    """
+
+    # Name of the cache in the logs
+    name = "disk cache"
+
+    def __init__(self, directory: str, max_size: int):
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+        # Size of the entries, computed on the first store
+        self.size = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".pickle")
+
+    def load(self, key: str) -> object:
+        """
+        Returns the entry of a key (None if there is none). Corrupt entries
+        are removed.
+        """
+        filename = self.path(key)
+        try:
+            with open(filename, 'rb') as fh:
+                entry = pickle.load(fh)
+            # Marks the entry as recently used
+            os.utime(filename)
+            self.hits += 1
+            return entry
+        except FileNotFoundError:
+            pass
+        except (pickle.UnpicklingError, EOFError, AttributeError,
+                ValueError) as e:
+            logging.warning(
+                f"Evicted corrupt {self.name} entry {filename}: {e}")
+            try:
+                os.remove(filename)
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+
+        self.misses += 1
+        return None
+
+    def store(self, key: str, entry: object):
+        filename = self.path(key)
+        try:
+            data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        except RecursionError:
+            # Pickling recurses on the depth of the entry, and very deep ones
+            # (e.g. the trees of generated code) exceed the recursion limit
+            logging.warning(f"Not caching {filename}: too deep to pickle")
+            return
+
+        # Written to a temporary file first, so that other processes never
+        # read a partial entry
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(data)
+        os.replace(tmp, filename)
+
+        if self.size is None:
+            self.size = sum(size for _, _, size in self.entries())
+        else:
+            self.size += len(data)
+
+        if self.size > self.max_size:
+            self.evict()
+
+    def entries(self) -> list[tuple[float, str, int]]:
+        """
+        Returns the last use, path and size of each entry
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".pickle"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                # Evicted by another process
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+        return entries
+
+    def evict(self):
+        """
+        Removes the least recently used entries, until the cache takes at most
+        3/4 of its maximum size (so that it isn't evicted on every store)
+        """
+        entries = sorted(self.entries())
+        self.size = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if self.size <= self.max_size * 3 // 4:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.size -= size
+            self.evictions += 1
+        logging.info(f"Evicted {self.name} entries, {self.size} bytes left")
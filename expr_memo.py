@@ -0,0 +1,64 @@
+from __future__ import annotations
+from flow_follow import *
+
+
+class ExprMemo:
+    """
+    Memo of the multilabels of the names and attribute chains read by
+    expressions (see `IFVisitor.evaluate`). A read combines the multilabel of
+    the name with its sources and the context, and statements often read the
+    same name several times (e.g. `request` in several arguments). Entries
+    hold for a version of the multilabelling (the object, and the number of
+    its changes in place, see `MultiLabelling.version`), of the context (the
+    multilabel on top of the stack) and the policy. When a statement only
+    changes some names, the entries that read other names are kept for the
+    multilabelling it returns (see `carry`).
+    """
+
+    def __init__(self):
+        self.mtlb = None
+        self.version = None
+        self.context = None
+        self.policy = None
+
+        # Maps each read, a tuple of the (name, lineno) of the elements of the
+        # chain, to its multilabel (which is only read, never changed), and
+        # each name to the reads of it
+        self.values = {}
+        self.reads = {}
+
+    def get(self, key: tuple, mtlb: MultiLabelling, context: MultiLabel,
+            policy: Policy) -> MultiLabel:
+        """
+        Returns the multilabel of a read (None if it isn't known), starting
+        again if the multilabelling, context or policy changed
+        """
+        if (self.mtlb is not mtlb or self.version != mtlb.version
+                or self.context is not context or self.policy is not policy):
+            self.mtlb = mtlb
+            self.version = mtlb.version
+            self.context = context
+            self.policy = policy
+            self.values = {}
+            self.reads = {}
+        return self.values.get(key)
+
+    def set(self, key: tuple, mlb: MultiLabel):
+        self.values[key] = mlb
+        for name, _ in key:
+            self.reads.setdefault(name, []).append(key)
+
+    def carry(self, old: MultiLabelling, version: int, new: MultiLabelling,
+              names: list[str]):
+        """
+        Keeps the entries for a new multilabelling that only differs from the
+        old one (at the given version) in the given names, except the ones
+        that read them
+        """
+        if self.mtlb is not old or self.version != version:
+            return
+        self.mtlb = new
+        self.version = new.version
+        for name in names:
+            for key in self.reads.pop(name, ()):
+                self.values.pop(key, None)
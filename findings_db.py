@@ -0,0 +1,259 @@
+from __future__ import annotations
+import argparse, sqlite3, time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    hash TEXT NOT NULL,
+    policy_hash TEXT NOT NULL,
+    options_hash TEXT NOT NULL DEFAULT '',
+    scanned_at REAL NOT NULL,
+    elapsed_ms INTEGER NOT NULL,
+    partial INTEGER NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS findings (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    pattern TEXT NOT NULL,
+    source TEXT NOT NULL,
+    source_lineno INTEGER NOT NULL,
+    sink TEXT NOT NULL,
+    sink_lineno INTEGER NOT NULL,
+    unsanitized INTEGER NOT NULL,
+    approximated INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sanitized_flows (
+    finding_id INTEGER NOT NULL REFERENCES findings(id) ON DELETE CASCADE,
+    flow INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    sanitizer TEXT NOT NULL,
+    lineno INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS findings_file ON findings(file_id);
+CREATE INDEX IF NOT EXISTS findings_pattern ON findings(pattern);
+CREATE INDEX IF NOT EXISTS findings_sink ON findings(sink);
+CREATE INDEX IF NOT EXISTS findings_unsanitized ON findings(unsanitized);
+CREATE INDEX IF NOT EXISTS sanitized_flows_finding ON sanitized_flows(finding_id);
+"""
+
+# Columns added to the tables since they were first created, which are added
+# to the databases created before
+COLUMNS = {
+    "files": [("options_hash", "TEXT NOT NULL DEFAULT ''"), ("error", "TEXT")]
+}
+
+
+class FindingsDB:
+    """
+    SQLite database with the findings of a scan (see `scan.py`), one row per
+    (source, sink, pattern) and one row per sanitizer of each sanitized flow.
+    Files are identified by path, and rescanning one replaces its findings.
+    Files that couldn't be analysed are recorded with the error (and without
+    findings). Writes are grouped in transactions of `batch_size` files.
+    """
+
+    def __init__(self, filename: str, batch_size: int = 100):
+        self.connection = sqlite3.connect(filename)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+        for table, columns in COLUMNS.items():
+            existing = {
+                row[1]
+                for row in self.connection.execute(
+                    f"PRAGMA table_info({table})")
+            }
+            for name, definition in columns:
+                if name not in existing:
+                    self.connection.execute(
+                        f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+        self.batch_size = batch_size
+        # Files recorded since the last commit
+        self.pending = 0
+
+    def is_current(self, path: str, hash: str, policy_hash: str,
+                   options_hash: str) -> bool:
+        """
+        Returns whether the findings recorded for the file are the ones of
+        its current content, policy and options (see `Options.findings_hash`),
+        so it doesn't have to be scanned. Partial findings, and files that
+        couldn't be analysed, are never current.
+        """
+        row = self.connection.execute(
+            "SELECT hash, policy_hash, options_hash, partial, error FROM files WHERE path = ?",
+            (path, )).fetchone()
+        return row is not None and row == (hash, policy_hash, options_hash, 0,
+                                           None)
+
+    def record(self, path: str, hash: str, policy_hash: str, options_hash: str,
+               findings: dict[tuple, tuple[list, bool]], elapsed_ms: int,
+               partial: bool):
+        """
+        Replaces the findings (see `Vulnerability.findings`) recorded for a
+        file
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("DELETE FROM files WHERE path = ?", (path, ))
+        cursor.execute(
+            "INSERT INTO files (path, hash, policy_hash, options_hash, scanned_at, elapsed_ms, partial) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (path, hash, policy_hash, options_hash, time.time(), elapsed_ms,
+             int(partial)))
+        file_id = cursor.lastrowid
+
+        flows = []
+        for key in findings:
+            traces, approximated = findings[key]
+            (src_name, src_lineno), (sink_name, sink_lineno), pattern = key
+
+            sanitized = []
+            for trace in traces:
+                if len(trace) > 0 and trace not in sanitized:
+                    sanitized.append(trace)
+            unsanitized = len(sanitized) < len(traces)
+
+            cursor.execute(
+                "INSERT INTO findings (file_id, pattern, source, source_lineno, sink, sink_lineno, unsanitized, approximated) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (file_id, pattern, src_name, src_lineno, sink_name,
+                 sink_lineno, int(unsanitized), int(approximated)))
+            finding_id = cursor.lastrowid
+
+            for flow, trace in enumerate(sanitized):
+                for position, (name, lineno) in enumerate(trace):
+                    flows.append((finding_id, flow, position, name, lineno))
+
+        cursor.executemany(
+            "INSERT INTO sanitized_flows (finding_id, flow, position, sanitizer, lineno) VALUES (?, ?, ?, ?, ?)",
+            flows)
+
+        self.added()
+
+    def record_failure(self, path: str, hash: str, policy_hash: str,
+                       options_hash: str, error: str):
+        """
+        Replaces the findings recorded for a file by the error that kept it
+        from being analysed
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("DELETE FROM files WHERE path = ?", (path, ))
+        cursor.execute(
+            "INSERT INTO files (path, hash, policy_hash, options_hash, scanned_at, elapsed_ms, partial, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (path, hash, policy_hash, options_hash, time.time(), 0, 0, error))
+        self.added()
+
+    def added(self):
+        self.pending += 1
+        if self.pending >= self.batch_size:
+            self.commit()
+
+    def commit(self):
+        self.connection.commit()
+        self.pending = 0
+
+    def close(self):
+        self.commit()
+        self.connection.close()
+
+    def findings(self,
+                 pattern: str = None,
+                 sink: str = None,
+                 path: str = None,
+                 unsanitized: bool = None) -> list[tuple]:
+        """
+        Returns the findings (file, pattern, source, sink and whether there
+        is some unsanitized flow) that match the given filters
+        """
+        conditions = []
+        params = []
+        for column, value in (("f.pattern", pattern), ("f.sink", sink),
+                              ("files.path", path)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if unsanitized is not None:
+            conditions.append("f.unsanitized = ?")
+            params.append(int(unsanitized))
+
+        where = " AND ".join(conditions) if conditions else "1"
+        return self.connection.execute(
+            f"SELECT files.path, f.pattern, f.source, f.source_lineno, f.sink, f.sink_lineno, f.unsanitized FROM findings f JOIN files ON files.id = f.file_id WHERE {where} ORDER BY files.path, f.sink_lineno, f.id",
+            params).fetchall()
+
+    def costs(self) -> dict[str, int]:
+        """
+        Returns the time (in milliseconds) the last analysis of each file
+        took
+        """
+        return dict(
+            self.connection.execute("SELECT path, elapsed_ms FROM files"))
+
+    def failures(self) -> list[tuple[str, str]]:
+        """
+        Returns the files that couldn't be analysed, and why
+        """
+        return self.connection.execute(
+            "SELECT path, error FROM files WHERE error IS NOT NULL ORDER BY path"
+        ).fetchall()
+
+    def summary(self, column: str) -> list[tuple]:
+        """
+        Returns the number of findings (and how many of them have some
+        unsanitized flow) for each value of a column (pattern, sink or path)
+        """
+        assert column in ("pattern", "sink", "path")
+        return self.connection.execute(
+            f"SELECT {column}, COUNT(*), SUM(f.unsanitized) FROM findings f JOIN files ON files.id = f.file_id GROUP BY {column} ORDER BY COUNT(*) DESC, {column}"
+        ).fetchall()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog='findings_db',
+        description='queries the findings of a scan stored by scan.py')
+    parser.add_argument('db')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    query = commands.add_parser('findings', help='lists the findings')
+    query.add_argument('--pattern')
+    query.add_argument('--sink')
+    query.add_argument('--file', dest='path')
+    status = query.add_mutually_exclusive_group()
+    status.add_argument('--unsanitized',
+                        action='store_const',
+                        const=True,
+                        help='only findings with some unsanitized flow')
+    status.add_argument('--sanitized',
+                        dest='unsanitized',
+                        action='store_const',
+                        const=False,
+                        help='only findings whose flows are all sanitized')
+
+    summary = commands.add_parser(
+        'summary', help='counts the findings by pattern, sink or file')
+    summary.add_argument('--by',
+                         choices=['pattern', 'sink', 'file'],
+                         default='pattern')
+
+    commands.add_parser('failures',
+                        help='lists the files that couldn\'t be analysed')
+    args = parser.parse_args()
+
+    db = FindingsDB(args.db)
+    if args.command == 'findings':
+        findings = db.findings(args.pattern, args.sink, args.path,
+                               args.unsanitized)
+        for (path, pattern, src, src_lineno, sink, sink_lineno,
+             unsanitized) in findings:
+            status = "unsanitized" if unsanitized else "sanitized"
+            print(
+                f"{path}:{sink_lineno}: {pattern}: {src}@{src_lineno} -> {sink}@{sink_lineno} ({status})"
+            )
+    elif args.command == 'failures':
+        for path, error in db.failures():
+            print(f"{path}: {error}")
+    else:
+        column = 'path' if args.by == 'file' else args.by
+        for value, count, unsanitized in db.summary(column):
+            print(f"{value}\t{count}\t{unsanitized} unsanitized")
+    db.close()
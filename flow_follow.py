@@ -1,5 +1,5 @@
 from __future__ import annotations
-import logging, json
+import logging, json, weakref
 
 
 class Pattern:
@@ -81,6 +81,9 @@ class Source(Element):
     def get_source(self) -> Source:
         return self
 
+    def get_path(self) -> SanitizationPath:
+        return UNSANITIZED
+
     def __hash__(self) -> int:
         return hash(self.name) ^ hash(self.lineno)
 
@@ -93,43 +96,177 @@ class Source(Element):
         return Source(self.name, self.lineno)
 
 
-class Sanitized(Element):
+class SanitizationPath:
+    """
+    Node of the trie of sanitization paths, shared by all labels. A path is
+    the ordered sequence of sanitizers that were applied to a source, and is
+    identified by its parent path and its last sanitizer (so applying the same
+    sanitizer to the same path always yields the same node).
+    """
 
-    def __init__(self, name: str, lineno: int, of: Element):
-        super().__init__(name, lineno)
-        assert (type(of) == Source or type(of) == Sanitized)
+    # Whether the path is a summary of several paths (see `WidenedPath`)
+    approximated = False
 
-        self.name = name
-        self.lineno = lineno
+    def __init__(self, parent: SanitizationPath, sanitizer: Element):
+        self.parent = parent
+        self.sanitizer = sanitizer
+        self.depth = 0 if parent is None else parent.depth + 1
+        self._hash = hash((hash(parent), sanitizer))
+        # Maps (name, lineno) of a sanitizer to the path it leads to. Nodes are
+        # only kept alive by the values (and child paths) that use them
+        self.steps = weakref.WeakValueDictionary()
+        self._sanitizers = None
+        self._widened = None
+
+    def __repr__(self) -> str:
+        return " -> ".join(map(str, self.sanitizers())) or "<unsanitized>"
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if type(other) != SanitizationPath:
+            return False
+        return (self._hash == other._hash and self.sanitizer == other.sanitizer
+                and self.parent == other.parent)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def uses(self, name: str, lineno: int) -> bool:
+        """
+        Whether the sanitizer `name` called at `lineno` is part of the path
+        """
+        path = self
+        while path.parent is not None:
+            if path.sanitizer.name == name and path.sanitizer.lineno == lineno:
+                return True
+            path = path.parent
+        return False
 
-        if type(of) == Source:
-            self.of = of
-            self.used = {(self.name, self.lineno)}
-        else:
+    def apply(self, sanitizer: Element) -> SanitizationPath:
+        """
+        Returns the path obtained by applying a sanitizer after this path
+        """
+        key = (sanitizer.name, sanitizer.lineno)
+        path = self.steps.get(key)
+        if path is None:
             # If sanitizer already used, don't reuse
-            if (name, lineno) in of.used:
-                self.of = of.of
-                self.used = of.used
+            if self.uses(*key):
+                path = self
+            else:
+                path = SanitizationPath(self, Element(*key))
+            self.steps[key] = path
+        return path
+
+    def sanitizers(self) -> tuple[Element]:
+        """
+        Returns the sanitizers in the path, in the order they were applied
+        """
+        if self._sanitizers is None:
+            if self.parent is None:
+                self._sanitizers = ()
+            else:
+                self._sanitizers = self.parent.sanitizers() + (
+                    self.sanitizer, )
+        return self._sanitizers
+
+    def widen(self) -> WidenedPath:
+        """
+        Returns the summary of the path (i.e. forgets the order in which the
+        sanitizers were applied)
+        """
+        if self._widened is None:
+            self._widened = WidenedPath(frozenset(self.sanitizers()))
+        return self._widened
+
+
+class WidenedPath(SanitizationPath):
+    """
+    Summary of the paths made of (some of) a set of sanitizers. Used instead of
+    the exact paths when they are too long or too many to be tracked, so the
+    flows that go through it are reported as approximated.
+    """
+
+    approximated = True
+
+    def __init__(self, members: frozenset[Element]):
+        self.parent = None
+        self.sanitizer = None
+        self.members = members
+        self.depth = len(members)
+        self._hash = hash(members)
+        self.steps = weakref.WeakValueDictionary()
+        # Reported by line, as the order is unknown
+        self._sanitizers = tuple(
+            sorted(members, key=lambda el: (el.lineno, el.name)))
+        self._widened = self
+
+    def __repr__(self) -> str:
+        return f"any of {{ {', '.join(map(str, self._sanitizers))} }}"
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if type(other) != WidenedPath:
+            return False
+        return self.members == other.members
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def uses(self, name: str, lineno: int) -> bool:
+        return Element(name, lineno) in self.members
+
+    def apply(self, sanitizer: Element) -> SanitizationPath:
+        key = (sanitizer.name, sanitizer.lineno)
+        path = self.steps.get(key)
+        if path is None:
+            if self.uses(*key):
+                path = self
             else:
-                self.of = of
-                self.used = {(name, lineno)}.union(of.used)
+                path = WidenedPath(self.members | {Element(*key)})
+            self.steps[key] = path
+        return path
+
+
+# Path of the values that were not sanitized
+UNSANITIZED = SanitizationPath(None, None)
+
+
+class Sanitized(Element):
+    """
+    Flow from a source that went through a (non empty) sanitization path. The
+    element name and line are the ones of the last sanitizer applied.
+    """
+
+    def __init__(self, source: Source, path: SanitizationPath):
+        assert (type(source) == Source)
+        assert (path.depth > 0)
+        last = path.sanitizers()[-1]
+        super().__init__(last.name, last.lineno)
+        self.source = source
+        self.path = path
 
     def __repr__(self) -> str:
-        return f"Sanitized({self.name}@{self.lineno} | {self.of})"
+        return f"Sanitized({self.path} | {self.source})"
 
     def get_source(self) -> Source:
-        return self.of.get_source()
+        return self.source
+
+    def get_path(self) -> SanitizationPath:
+        return self.path
 
     def __hash__(self) -> int:
-        return hash(self.name) ^ hash(self.lineno) ^ hash(self.of)
+        return hash(self.source) ^ hash(self.path)
 
     def __eq__(self, other) -> bool:
         if not isinstance(other, Sanitized):
             return False
-        return self.name == other.name and self.lineno == other.lineno and self.of == other.of
+        return self.path == other.path and self.source == other.source
 
     def clone(self) -> Self:
-        return Sanitized(self.name, self.lineno, self.of.clone())
+        # Paths are immutable and shared, only the source is copied
+        return Sanitized(self.source.clone(), self.path)
 
 
 class Label:
@@ -160,13 +297,28 @@ class Label:
         for s in sources:
             self.add_source(source)
 
-    def add_sanitizer(self, sanitizer: Element):
+    def add_sanitizer(self, sanitizer: Element, max_length: int = None):
+        """
+        Applies sanitizer to all the values of the label. Paths longer than
+        `max_length` (if provided) are widened.
+        """
         assert (type(sanitizer) == Element)
-        # Sanitizer sanitizes all existing sources
+        # Sanitizer sanitizes all existing sources. Values that share a path
+        # share the transition, which is computed only once
+        steps = {}
         new = set()
         for val in self.values:
-            new_val = Sanitized(sanitizer.name, sanitizer.lineno, val)
-            new.add(new_val)
+            path = val.get_path()
+            if path not in steps:
+                steps[path] = path.apply(sanitizer)
+                if max_length is not None and steps[path].depth > max_length:
+                    steps[path] = steps[path].widen()
+
+            new_path = steps[path]
+            if new_path is path:
+                new.add(val)
+            else:
+                new.add(Sanitized(val.get_source(), new_path))
 
         self.values = new
 
@@ -174,21 +326,41 @@ class Label:
         for s in sanitizers:
             self.add_sanitizer(s)
 
+    def widen(self, max_flows: int):
+        """
+        If the label has more than `max_flows` values, the sanitized flows of
+        each source are replaced by a single summary flow (unsanitized flows
+        are kept, so that they are still reported as such)
+        """
+        if len(self.values) <= max_flows:
+            return
+
+        summaries = {}
+        new = set()
+        for val in self.values:
+            if type(val) == Source:
+                new.add(val)
+                continue
+
+            src = val.get_source()
+            summaries[src] = summaries.get(src, frozenset()).union(
+                val.get_path().sanitizers())
+
+        for src in summaries:
+            new.add(Sanitized(src, WidenedPath(summaries[src])))
+
+        logging.debug(f"Widened label of {self.pattern} to {new}")
+        self.values = new
+
     def combine(self, other: Self) -> Self:
         assert (self.pattern == other.pattern)
         return Label(self.pattern, self.values.union(other.values))
 
     def clone(self) -> Self:
         """
-        Returns deep copy (immutable, not deep copy needed)
+        Returns copy (values are immutable, so they are shared)
         """
-
-        new = set()
-
-        for el in self.values:
-            new.add(el.clone())
-
-        return Label(self.pattern, new)
+        return Label(self.pattern, set(self.values))
 
     def __repr__(self) -> str:
         return f"Label[{self.pattern}] {{ {self.values} }}"
@@ -201,16 +373,26 @@ class MultiLabel:
     different label policies (i.e. a vector of labels)
     """
 
-    def __init__(self, labels: dict[str, Label]):
+    def __init__(self, labels: dict[str, Label], uninitialized: str = None):
         # Maps pattern name to labels
         assert (type(labels) == dict)
         self.labels = labels
 
+        # Name of the variable whose uninitialized value is part of the
+        # multilabel. It is a source for every pattern, at the line where the
+        # variable is first read (see `resolve`), so it is only expanded then
+        self.uninitialized = uninitialized
+
     def __eq__(self, other) -> bool:
         if not isinstance(other, MultiLabel):
             return False
 
-        if list(self.labels.keys()) != list(other.labels.keys()):
+        if self.uninitialized != other.uninitialized:
+            return False
+
+        # Labels are compared by pattern, whatever the order they were added
+        # in (e.g. summaries add them in the order of their terms)
+        if self.labels.keys() != other.labels.keys():
             return False
 
         for var in self.labels:
@@ -236,6 +418,8 @@ class MultiLabel:
         """
 
         combination = self.clone()
+        if combination.uninitialized is None:
+            combination.uninitialized = other.uninitialized
 
         for pattern in other.labels:
             if pattern not in combination.labels:
@@ -246,6 +430,20 @@ class MultiLabel:
 
         return combination
 
+    def update(self, other: MultiLabel):
+        """
+        Point wise combination of multilabels, in place (the labels of the
+        other multilabel are copied, not shared)
+        """
+        if self.uninitialized is None:
+            self.uninitialized = other.uninitialized
+
+        for pattern, lbl in other.labels.items():
+            if pattern in self.labels:
+                self.labels[pattern].values |= lbl.values
+            else:
+                self.labels[pattern] = Label(pattern, set(lbl.values))
+
     def clone(self) -> MultiLabel:
         """
         Returns deep copy
@@ -253,7 +451,32 @@ class MultiLabel:
 
         return MultiLabel(
             {name: self.labels[name].clone()
-             for name in self.labels})
+             for name in self.labels}, self.uninitialized)
+
+    def resolve(self, lineno: int, policy: Policy) -> MultiLabel:
+        """
+        Returns the multilabel with the uninitialized value, if any, replaced
+        by a source for every pattern at the given line (the first read of the
+        variable). It is a new one, so the multilabellings that share this one
+        still have the uninitialized value
+        """
+        if self.uninitialized is None:
+            return self
+
+        src = Source(self.uninitialized, lineno)
+        labels = dict(self.labels)
+        for pattern in policy.patterns:
+            lbl = labels.get(pattern.name)
+            labels[pattern.name] = Label(
+                pattern.name, (set() if lbl is None else lbl.values) | {src})
+        return MultiLabel(labels)
+
+    def widen(self, max_flows: int):
+        """
+        Widens (in place) each of the labels (see `Label.widen`)
+        """
+        for lbl in self.labels.values():
+            lbl.widen(max_flows)
 
     def filter_implicit(self, policy: Policy) -> MultiLabel:
         """
@@ -271,6 +494,8 @@ class MultiLabel:
         s = f"MultiLabel {{ "
         for lbl in self.labels.values():
             s += f"{str(lbl)}, "
+        if self.uninitialized is not None:
+            s += f"uninitialized {self.uninitialized}, "
         s += f" }}"
         return s
 
@@ -284,6 +509,28 @@ class Policy:
     def __init__(self, patterns: list[Pattern]):
         self.patterns = patterns
 
+        # Maps each name to the patterns (names) it is a source, sanitizer or
+        # sink of, and each pattern name to the pattern, so lookups don't go
+        # through all patterns. The policy isn't changed by the analysis, so
+        # it can be built once and shared by any number of analyses
+        self.sources = Policy.index(patterns, lambda p: p.sources)
+        self.sanitizers = Policy.index(patterns, lambda p: p.sanitizers)
+        self.sinks = Policy.index(patterns, lambda p: p.sinks)
+        self.by_name = {}
+        for pattern in patterns:
+            self.by_name.setdefault(pattern.name, pattern)
+
+    def index(patterns: list[Pattern], names) -> dict[str, list[str]]:
+        """
+        Maps each of the names that `names` returns for some pattern to the
+        patterns (in order) it was returned for
+        """
+        index = {}
+        for pattern in patterns:
+            for name in dict.fromkeys(names(pattern)):
+                index.setdefault(name, []).append(pattern.name)
+        return index
+
     def get_vulnerabilities(self) -> list[str]:
         """
         Returns the vulnerabilities that are being considered
@@ -299,31 +546,28 @@ class Policy:
             map(lambda p: p.name, filter(lambda p: p.implicit, self.patterns)))
 
     def get_vulnerability(self, name: str) -> Pattern:
-        return list(filter(lambda p: p.name == name, self.patterns))[0]
+        return self.by_name[name]
 
     def search_source(self, name: str) -> list[str]:
         """
-        Returns the vulnerabilities that have a given name as source
+        Returns the vulnerabilities that have a given name as source (the list
+        is shared, it must not be changed)
         """
-        return list(
-            map(lambda p: p.name,
-                filter(lambda p: name in p.sources, self.patterns)))
+        return self.sources.get(name, [])
 
     def search_sanitizer(self, name: str) -> list[str]:
         """
-        Returns the vulnerabilities that have a given name as sanitizer
+        Returns the vulnerabilities that have a given name as sanitizer (the
+        list is shared, it must not be changed)
         """
-        return list(
-            map(lambda p: p.name,
-                filter(lambda p: name in p.sanitizers, self.patterns)))
+        return self.sanitizers.get(name, [])
 
     def search_sink(self, name: str) -> list[str]:
         """
-        Returns the vulnerabilities that have a given name as sink
+        Returns the vulnerabilities that have a given name as sink (the list
+        is shared, it must not be changed)
         """
-        return list(
-            map(lambda p: p.name,
-                filter(lambda p: name in p.sinks, self.patterns)))
+        return self.sinks.get(name, [])
 
     def find_illegal(self, sink: str, ml: MultiLabel) -> MultiLabel:
         """
@@ -335,10 +579,11 @@ class Policy:
         """
 
         bad_labels = {}
-        for pattern in self.patterns:
-            if pattern.is_sink(sink):
-                lbl = ml.get_label(pattern.name)
-                bad_labels[lbl.pattern] = lbl
+        for pattern in self.search_sink(sink):
+            # Not `get_label`, which would add the label to the multilabel
+            # (that might be in a multilabelling already)
+            lbl = ml.labels.get(pattern)
+            bad_labels[pattern] = Label(pattern, set()) if lbl is None else lbl
 
         return MultiLabel(bad_labels)
 
@@ -352,17 +597,23 @@ class Policy:
 
 class MultiLabelling:
     """
-    Mapping from variable names to list of multilabels
+    Mapping from variable names to list of multilabels. The multilabels are
+    never changed in place once they are in a multilabelling (they are
+    replaced), so copies share them.
     """
 
     def __init__(self, mapping: dict[str, MultiLabel]):
         self.mapping = mapping
 
+        # Number of changes of the mapping in place (see `expr_memo`). Copies
+        # are new multilabellings, so they start again
+        self.version = 0
+
     def __eq__(self, other) -> bool:
         if not isinstance(other, MultiLabelling):
             return False
 
-        if list(self.mapping.keys()) != list(other.mapping.keys()):
+        if self.mapping.keys() != other.mapping.keys():
             return False
 
         for var in self.mapping:
@@ -383,6 +634,7 @@ class MultiLabelling:
         Set multilabel of given name to provided value
         """
         self.mapping[variable] = ml
+        self.version += 1
 
     def mlabel_add(self, variable: str, ml: Multilabel):
         """
@@ -392,16 +644,48 @@ class MultiLabelling:
             self.mapping[variable] = MultiLabel()
 
         self.mapping[variable] = self.mapping[variable].combine(ml)
+        self.version += 1
 
     def clone(self) -> MultiLabelling:
         """
-        Returns deep copy
+        Returns copy (multilabels are shared)
         """
 
-        return MultiLabelling({
-            variable: self.mapping[variable].clone()
-            for variable in self.mapping
-        })
+        return MultiLabelling(dict(self.mapping))
+
+    def size(self) -> int:
+        """
+        Returns the number of flows in the multilabelling (used as an
+        approximation of its memory footprint)
+        """
+        return sum(
+            len(lbl.values) for ml in self.mapping.values()
+            for lbl in ml.labels.values()) + sum(
+                ml.uninitialized is not None for ml in self.mapping.values())
+
+    def prune(self, live: set[str]) -> list[str]:
+        """
+        Removes (in place) the names that are not live, i.e. that are not read
+        before being assigned again, and returns them
+        """
+        dead = [var for var in self.mapping if var not in live]
+        for variable in dead:
+            del self.mapping[variable]
+        if dead:
+            self.version += 1
+        return dead
+
+    def widen(self, max_flows: int):
+        """
+        Widens (in place) the multilabels of all names (see `Label.widen`),
+        replacing the ones with too many flows by widened copies
+        """
+        for variable, ml in self.mapping.items():
+            if any(len(lbl.values) > max_flows for lbl in ml.labels.values()):
+                ml = ml.clone()
+                ml.widen(max_flows)
+                self.mapping[variable] = ml
+        self.version += 1
 
     def combine(self, other: Self) -> Self:
         """
@@ -418,7 +702,7 @@ class MultiLabelling:
                 combination.mapping[variable] = MultiLabel({})
 
             combination.mapping[variable] = combination.mapping[
-                variable].combine(other.mapping[variable].clone())
+                variable].combine(other.mapping[variable])
 
         return combination
 
@@ -436,8 +720,10 @@ class Vulnerability:
     a program slice.
     """
 
-    def __init__(self, illegal_flows: dict[str, list[MultiLabel]] = {}):
-        self.illegal_flows = illegal_flows  # Maps vulnerability name to illegal flows
+    def __init__(self, illegal_flows: dict[str, list[MultiLabel]] = None):
+        # Maps vulnerability name to illegal flows (not shared by default, so
+        # analyses don't see each other's flows)
+        self.illegal_flows = illegal_flows if illegal_flows is not None else {}
 
     def save(self, sink: Element, ml: MultiLabel):
         """
@@ -458,32 +744,60 @@ class Vulnerability:
         s += f" }}"
         return s
 
-    def to_json(self) -> str:
+    def flow_order(val: Element) -> tuple:
+        """
+        Key used to order the flows of a label when reporting them (so the
+        report doesn't depend on the order of iteration of sets)
+        """
+        src = val.get_source()
+        return (src.lineno, src.name, [(san.lineno, san.name)
+                                       for san in val.get_path().sanitizers()])
+
+    def findings(self) -> dict[tuple, tuple[list, bool]]:
+        """
+        Returns the illegal flows, mapping each (source, sink, pattern) to the
+        sanitization traces of its flows (an empty trace being an unsanitized
+        flow) and whether some trace is approximated.
+        Findings are ordered by sink (by first occurrence), then by pattern (in
+        the order of the policy) and then by source (by first occurrence).
+        """
         vulns = {}
 
         for sink in self.illegal_flows:
-            flows = self.illegal_flows[sink]
+            # Maps each pattern to its findings for this sink
+            by_pattern = {}
             for mlb in self.illegal_flows[sink]:
                 for lbl in mlb.labels.values():
-                    for val in lbl.values:
+                    keys = by_pattern.setdefault(lbl.pattern, {})
+                    for val in sorted(lbl.values,
+                                      key=Vulnerability.flow_order):
                         src = val.get_source()
                         key = ((src.name, src.lineno),
                                (sink.name, sink.lineno), lbl.pattern)
-                        if key not in vulns:
-                            vulns[key] = []
+                        if key not in keys:
+                            keys[key] = ([], False)
+
+                        path = val.get_path()
+                        traces, approximated = keys[key]
+                        traces.append([[san.name, san.lineno]
+                                       for san in path.sanitizers()])
+                        keys[key] = (traces, approximated or path.approximated)
 
-                        sanitization = []
-                        while type(val) != Source:
-                            sanitization.append([val.name, val.lineno])
-                            val = val.of
+            for keys in by_pattern.values():
+                vulns.update(keys)
 
-                        vulns[key].append(sanitization)
+        return vulns
 
+    def findings_to_list(vulns: dict[tuple, tuple[list, bool]]) -> list[dict]:
+        """
+        Formats findings (see `findings`) as the (JSON) objects of the output
+        of the analysis
+        """
         ans = []
         count = {}
 
         for key in vulns:
-            traces = vulns[key]
+            traces, approximated = vulns[key]
             src, sink, vuln_name = key
             src_name, src_lineno = src
             sink_name, sink_lineno = sink
@@ -502,10 +816,22 @@ class Vulnerability:
                 if len(trace) == 0:
                     empty = True
                 else:
-                    if trace[::-1] not in d["sanitized_flows"]:
-                        d["sanitized_flows"].append(trace[::-1])
+                    if trace not in d["sanitized_flows"]:
+                        d["sanitized_flows"].append(trace)
 
             d["unsanitized_flows"] = "yes" if empty else "no"
+            if approximated:
+                # Some sanitized flows are summaries (see `WidenedPath`)
+                d["approximated"] = "yes"
             ans.append(d)
 
-        return json.dumps(ans, indent=4)
+        return ans
+
+    def findings_to_json(vulns: dict[tuple, tuple[list, bool]]) -> str:
+        """
+        Formats findings (see `findings`) as the output of the analysis
+        """
+        return json.dumps(Vulnerability.findings_to_list(vulns), indent=4)
+
+    def to_json(self) -> str:
+        return Vulnerability.findings_to_json(self.findings())
@@ -0,0 +1,56 @@
+from __future__ import annotations
+from flow_follow import *
+
+# Statuses of the flows that a gate can be set to fail on
+STATUSES = ("any", "unsanitized", "sanitized")
+
+
+class GateTripped(Exception):
+    """
+    Raised (from `Gate.save`) to stop the analysis at the first qualifying
+    flow
+    """
+
+
+class Gate(Vulnerability):
+    """
+    Collects illegal flows only until the first one of the given status (see
+    `STATUSES`), which stops the analysis. Used when only whether there is
+    such a flow matters.
+    """
+
+    def __init__(self, status: str = "any"):
+        super().__init__({})
+        assert status in STATUSES
+        self.status = status
+        # The first qualifying flow: sink, pattern and value
+        self.tripped = None
+
+    def qualifies(self, val: Element) -> bool:
+        if self.status == "unsanitized":
+            return val.get_path().depth == 0
+        elif self.status == "sanitized":
+            return val.get_path().depth > 0
+        return True
+
+    def save(self, sink: Element, ml: MultiLabel):
+        for lbl in ml.labels.values():
+            for val in sorted(lbl.values, key=Vulnerability.flow_order):
+                if self.qualifies(val):
+                    self.tripped = (sink, lbl.pattern, val)
+                    raise GateTripped()
+
+    def findings(self) -> dict[tuple, tuple[list, bool]]:
+        """
+        Returns the first qualifying flow, as findings (see
+        `Vulnerability.findings`)
+        """
+        if self.tripped is None:
+            return {}
+
+        sink, pattern, val = self.tripped
+        src = val.get_source()
+        path = val.get_path()
+        key = ((src.name, src.lineno), (sink.name, sink.lineno), pattern)
+        trace = [[san.name, san.lineno] for san in path.sanitizers()]
+        return {key: ([trace], path.approximated)}
@@ -0,0 +1,210 @@
+from __future__ import annotations
+import ast
+from flow_follow import *
+from block_summary import BlockSummary, CONTEXT, sanitize
+from options import Options
+
+# Expressions that a condition can be made of for its loop to be closed (its
+# flows are then those of its names, see `LoopClosure`)
+CONDITION = (ast.Name, ast.Constant, ast.BinOp, ast.BoolOp, ast.UnaryOp,
+             ast.Compare, ast.expr_context, ast.operator, ast.boolop,
+             ast.unaryop, ast.cmpop)
+
+
+class LoopClosure:
+    """
+    The flow graph of a loop whose body is a single block of straight-line
+    code (see `BlockSummary`): each name the body assigns is a node, as is
+    the context of the condition, and the terms of the summary whose origin
+    is one of them (the name before the body, or the context) are its edges
+    (to the names assigned and the sinks reached, with the sanitizers of the
+    term). The condition adds edges from the names it reads to the context.
+    The other terms are constant, so once the loop is analysed an iteration,
+    every iteration only adds the flows that moved along the edges. Instead of
+    analysing the whole body again, only those flows are followed (see
+    `close`), level by level, until none is new: that is the fixed point, and
+    the level at which a flow reaches a sink is the iteration at which it
+    would be found (so the findings are reported in the same order).
+    """
+
+    def __init__(self, summary: BlockSummary, condition: list[str]):
+        self.summary = summary
+
+        # Maps each node to the terms that read it: the name assigned, or
+        # the index of the sink reached, and the steps of the term
+        self.edges = {}
+        for name, value in summary.values.items():
+            for origin, steps in value:
+                node = self.node(origin)
+                if node is not None:
+                    self.edges.setdefault(node, []).append(
+                        (("name", name), steps))
+        for i, (_, value) in enumerate(summary.sinks):
+            for origin, steps in value or ():
+                node = self.node(origin)
+                if node is not None:
+                    self.edges.setdefault(node, []).append(
+                        (("sink", i), steps))
+
+        # Names assigned by the body that the condition reads
+        self.condition = [name for name in condition if name in summary.values]
+
+        # Names whose uninitialized value an iteration resolves (see
+        # `MultiLabel.resolve`): the ones the graph reads, and the ones read
+        # from the multilabelling before the body, which are resolved in it
+        self.resolved = set(self.condition)
+        self.resolved.update(node for node in self.edges if node != CONTEXT)
+        self.resolved.update(name
+                             for name, (_, before) in summary.patches.items()
+                             if before)
+
+    def node(self, origin: tuple) -> object:
+        """
+        Returns the node of the origin of a term (None if it is constant)
+        """
+        if origin == CONTEXT:
+            return CONTEXT
+        if origin[0] == "name" and origin[1] in self.summary.values:
+            return origin[1]
+        return None
+
+    def of(node: ast.While, summary: BlockSummary, length: int) -> LoopClosure:
+        """
+        Returns the closure of a loop, given the summary of the block its body
+        starts with (None if it can't be closed: the body isn't a single block
+        or the condition isn't made of names and constants)
+        """
+        if summary is None or length < len(node.body) or not summary.replaces:
+            return None
+        if any(not isinstance(el, CONDITION) for el in ast.walk(node.test)):
+            return None
+        return LoopClosure(
+            summary,
+            sorted(
+                {el.id
+                 for el in ast.walk(node.test) if type(el) == ast.Name}))
+
+    def flows(mlb: MultiLabel) -> dict[str, set[Element]]:
+        return {pattern: lbl.values for pattern, lbl in mlb.labels.items()}
+
+    def new(flows: dict[str, set[Element]],
+            known: dict[str, set[Element]]) -> dict[str, set[Element]]:
+        """
+        Returns the flows that aren't known yet (and adds them to the known)
+        """
+        new = {}
+        for pattern, values in flows.items():
+            values = values - known.get(pattern, set())
+            if values:
+                new[pattern] = values
+                known[pattern] = known.get(pattern, set()) | values
+        return new
+
+    def close(self, before: MultiLabelling, mtlb: MultiLabelling,
+              context_before: MultiLabel, context: MultiLabel,
+              saved: list[tuple[Element, MultiLabel]], kept: set[str],
+              policy: Policy, vulns: Vulnerability,
+              options: Options) -> tuple[MultiLabelling, int]:
+        """
+        Returns the multilabelling at the fixed point of the loop, and the
+        number of levels followed, given the multilabelling and context before
+        and after its last iteration and the illegal flows saved in it (in
+        order, one for each sink of the summary). The flows found on the way
+        are saved. Returns None if the loop can't be closed yet: some name
+        the next iteration reads is uninitialized (its flows are only known
+        once it is read).
+        """
+        if len(saved) != len(self.summary.sinks):
+            return None
+        for name in self.resolved:
+            if name in mtlb.mapping and mtlb.mapping[
+                    name].uninitialized is not None:
+                return None
+
+        # The flows of each node so far, and the ones its last level added
+        known = {}
+        delta = {}
+        for name in self.summary.values:
+            if (kept is not None and name not in kept
+                    or name not in mtlb.mapping):
+                continue
+            known[name] = {
+                pattern: set(values)
+                for pattern, values in LoopClosure.flows(
+                    mtlb.mapping[name]).items()
+            }
+            old = LoopClosure.flows(
+                before.mapping[name]) if name in before.mapping else {}
+            delta[name] = {
+                pattern: values - old.get(pattern, set())
+                for pattern, values in known[name].items()
+            }
+        known[CONTEXT] = {
+            pattern: set(values)
+            for pattern, values in LoopClosure.flows(context).items()
+        }
+        delta[CONTEXT] = LoopClosure.new(LoopClosure.flows(context),
+                                         LoopClosure.flows(context_before))
+        sinks = [{
+            pattern: set(lbl.values)
+            for pattern, lbl in ml.labels.items()
+        } for _, ml in saved]
+        implicit = set(policy.get_implicit_vulnerabilities())
+
+        levels = 0
+        while any(any(flows.values()) for flows in delta.values()):
+            levels += 1
+            reached = {}
+            for node, flows in delta.items():
+                if not any(flows.values()):
+                    continue
+                for target, steps in self.edges.get(node, ()):
+                    moved = flows
+                    for step in steps:
+                        moved = sanitize(moved, step, options)
+                    into = reached.setdefault(target, {})
+                    for pattern, values in moved.items():
+                        into.setdefault(pattern, set()).update(values)
+
+            delta = {}
+            for name in known:
+                if name != CONTEXT:
+                    delta[name] = LoopClosure.new(
+                        reached.get(("name", name), {}), known[name])
+
+            # The context is the one of the condition after the level
+            condition = {}
+            for name in self.condition:
+                for pattern, values in delta.get(name, {}).items():
+                    if pattern in implicit:
+                        condition.setdefault(pattern, set()).update(values)
+            delta[CONTEXT] = LoopClosure.new(condition, known[CONTEXT])
+
+            for i, (sink, value) in enumerate(self.summary.sinks):
+                if value is None or ("sink", i) not in reached:
+                    continue
+                new = LoopClosure.new(
+                    {
+                        pattern: values
+                        for pattern, values in reached[("sink", i)].items()
+                        if pattern in policy.search_sink(sink.name)
+                    }, sinks[i])
+                if new:
+                    vulns.save(
+                        sink,
+                        MultiLabel({
+                            pattern:
+                            Label(pattern, new.get(pattern, set()))
+                            for pattern in policy.search_sink(sink.name)
+                        }))
+
+        closed = mtlb.clone()
+        for name in known:
+            if name == CONTEXT:
+                continue
+            # A copy, as the multilabels are shared (see `MultiLabelling`)
+            mlb = closed.mapping[name].clone()
+            for pattern, values in known[name].items():
+                mlb.get_label(pattern).values |= values
+            closed.mapping[name] = mlb
+        return closed, levels
@@ -0,0 +1,78 @@
+from __future__ import annotations
+from flow_follow import *
+
+
+def snapshot(mlb: MultiLabel) -> tuple:
+    """
+    Returns an immutable (and hashable) copy of the flows of a multilabel
+    """
+    return mlb.uninitialized, tuple(
+        (pattern,
+         frozenset(
+             (val.get_source().name, val.get_source().lineno, val.get_path())
+             for val in lbl.values)) for pattern, lbl in mlb.labels.items())
+
+
+def fingerprint(names: tuple[str], mtlb: MultiLabelling,
+                context: MultiLabel) -> tuple:
+    """
+    Returns what the analysis of a loop depends on: the multilabels of the
+    names it mentions (read or assigned) and the context it is analysed in
+    """
+    return tuple((var, snapshot(mtlb.mapping[var])) for var in names
+                 if var in mtlb.mapping), snapshot(context)
+
+
+class Recorder:
+    """
+    Forwards the illegal flows saved during the analysis of a loop to the
+    vulnerability, keeping them so they can be saved again
+    """
+
+    def __init__(self, vulns: Vulnerability):
+        self.vulns = vulns
+        self.saved = []
+
+    def save(self, sink: Element, ml: MultiLabel):
+        self.saved.append((sink, ml))
+        self.vulns.save(sink, ml)
+
+
+class LoopSummary:
+    """
+    The effect of analysing a loop from a given multilabelling (see
+    `fingerprint`): the multilabels of the names it mentions afterwards and
+    the illegal flows saved
+    """
+
+    def __init__(self, names: set[str], output: MultiLabelling,
+                 saved: list[tuple[Element, MultiLabel]]):
+        self.names = names
+        # Multilabels aren't changed once in a multilabelling, so they are
+        # shared (see `MultiLabelling`)
+        self.output = {
+            var: output.mapping[var]
+            for var in output.mapping if var in names
+        }
+        self.saved = saved
+
+    def replay(self, mtlb: MultiLabelling,
+               vulns: Vulnerability) -> MultiLabelling:
+        """
+        Applies the effect of the loop to a multilabelling with the same
+        fingerprint
+        """
+        for sink, ml in self.saved:
+            vulns.save(sink, ml)
+
+        # The names the loop doesn't mention are left unchanged
+        result = MultiLabelling({})
+        for var in mtlb.mapping:
+            if var not in self.names:
+                result.mapping[var] = mtlb.mapping[var]
+            elif var in self.output:
+                result.mapping[var] = self.output[var]
+        for var in self.output:
+            if var not in result.mapping:
+                result.mapping[var] = self.output[var]
+        return result
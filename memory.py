@@ -0,0 +1,214 @@
+from __future__ import annotations
+import json, os, tracemalloc
+from flow_follow import *
+
+# Traced memory has to grow by this factor over the last snapshot for another
+# one to be taken (so there are only a few snapshots, at the peaks)
+SNAPSHOT_GROWTH = 1.1
+
+
+class MemoryProfile:
+    """
+    Memory accounting of an analysis (see `--memory-profile`). The state is
+    measured after each statement (or summarized block) and each loop
+    iteration: its size (number of flows, see `MultiLabelling.size`), its
+    names and the objects it keeps alive (see `census`), and the memory traced
+    by `tracemalloc`. Lines are ranked by the peak growth of the state they
+    cause, and the allocation sites by the growth of the memory they hold at
+    its peak, so the constructs that cause blowups stand out.
+    """
+
+    def __init__(self, top: int = 10):
+        # Number of lines and allocation sites reported
+        self.top = top
+
+        # Maps each line and kind of record ("statement", "block" or
+        # "iteration") to the visits and peaks recorded for it
+        self.lines = {}
+
+        # Peaks of the objects in the state (see `census`) and of the flows
+        # of each pattern
+        self.objects = {}
+        self.patterns = {}
+
+        # Peak of the memory traced, in bytes
+        self.peak_traced = 0
+
+        # Snapshots of the traced memory before the analysis and at its last
+        # peak, and the allocation sites that grew the most between them
+        self.baseline = None
+        self.snapshot = None
+        self.snapshot_size = 0
+        self.sites = []
+
+        # Whether tracing was started by this profile (and so is stopped by
+        # it). Tracing is process-wide, so concurrent profiles in threads
+        # share it
+        self.tracing = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.tracing = True
+        self.baseline = MemoryProfile.take_snapshot()
+
+    def stop(self):
+        if self.snapshot is not None:
+            diff = self.snapshot.compare_to(self.baseline, "lineno")
+            self.sites = [{
+                "site":
+                f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                "size_kib": round(stat.size_diff / 1024, 1),
+                "count": stat.count_diff
+            } for stat in diff[:self.top] if stat.size_diff > 0]
+
+        # Snapshots are large, only the sites are kept
+        self.baseline = None
+        self.snapshot = None
+        if self.tracing:
+            tracemalloc.stop()
+            self.tracing = False
+
+    def take_snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)])
+
+    def mark(self, mtlb: MultiLabelling) -> tuple[int, int]:
+        """
+        Returns the size of the state and the memory traced, before a
+        statement or iteration (see `record`)
+        """
+        return mtlb.size(), tracemalloc.get_traced_memory()[0]
+
+    def record(self, lineno: int, kind: str, mark: tuple[int, int],
+               mtlb: MultiLabelling):
+        """
+        Records the state after a statement or iteration, given its mark
+        before it
+        """
+        size = mtlb.size()
+        traced, peak = tracemalloc.get_traced_memory()
+
+        entry = self.lines.setdefault(
+            (lineno, kind), {
+                "visits": 0,
+                "peak_state_growth": 0,
+                "peak_state": 0,
+                "peak_variables": 0,
+                "peak_memory_growth_kib": 0.0
+            })
+        entry["visits"] += 1
+        MemoryProfile.peak(entry, "peak_state_growth", size - mark[0])
+        MemoryProfile.peak(entry, "peak_state", size)
+        MemoryProfile.peak(entry, "peak_variables", len(mtlb.mapping))
+        MemoryProfile.peak(entry, "peak_memory_growth_kib",
+                           round((traced - mark[1]) / 1024, 1))
+
+        objects, patterns = MemoryProfile.census(mtlb)
+        for name, count in objects.items():
+            MemoryProfile.peak(self.objects, name, count)
+        for name, count in patterns.items():
+            MemoryProfile.peak(self.patterns, name, count)
+
+        self.peak_traced = max(self.peak_traced, peak)
+        if traced > self.snapshot_size * SNAPSHOT_GROWTH:
+            self.snapshot = MemoryProfile.take_snapshot()
+            self.snapshot_size = traced
+
+    def peak(counters: dict, name: str, value):
+        if value > counters.get(name, 0):
+            counters[name] = value
+
+    def census(mtlb: MultiLabelling) -> tuple[dict[str, int], dict[str, int]]:
+        """
+        Returns the number of distinct objects the state keeps alive (sources,
+        sanitized flows, sanitization paths and their sanitizers) and the
+        number of flows of each pattern
+        """
+        sources = set()
+        sanitized = set()
+        paths = set()
+        sanitizers = set()
+        patterns = {}
+        for mlb in mtlb.mapping.values():
+            for pattern, lbl in mlb.labels.items():
+                patterns[pattern] = patterns.get(pattern, 0) + len(lbl.values)
+                for val in lbl.values:
+                    if type(val) == Source:
+                        sources.add(id(val))
+                        continue
+                    sanitized.add(id(val))
+                    sources.add(id(val.get_source()))
+
+                    path = val.get_path()
+                    while path is not None and id(path) not in paths:
+                        paths.add(id(path))
+                        if path.approximated:
+                            sanitizers.update(map(id, path.members))
+                            break
+                        if path.sanitizer is not None:
+                            sanitizers.add(id(path.sanitizer))
+                        path = path.parent
+
+        return {
+            "variables": len(mtlb.mapping),
+            "sources": len(sources),
+            "sanitized": len(sanitized),
+            "paths": len(paths),
+            "sanitizers": len(sanitizers)
+        }, patterns
+
+    def merge(self, other: MemoryProfile):
+        """
+        Adds the profile of another (part of the) analysis
+        """
+        for key, other_entry in other.lines.items():
+            if key not in self.lines:
+                self.lines[key] = dict(other_entry)
+                continue
+            entry = self.lines[key]
+            entry["visits"] += other_entry["visits"]
+            for name in other_entry:
+                if name != "visits":
+                    MemoryProfile.peak(entry, name, other_entry[name])
+        for name, count in other.objects.items():
+            MemoryProfile.peak(self.objects, name, count)
+        for name, count in other.patterns.items():
+            MemoryProfile.peak(self.patterns, name, count)
+        self.peak_traced = max(self.peak_traced, other.peak_traced)
+
+        # The same site in several analyses is reported at its peak
+        sites = {}
+        for site in self.sites + other.sites:
+            if site["site"] not in sites or site["size_kib"] > sites[
+                    site["site"]]["size_kib"]:
+                sites[site["site"]] = site
+        self.sites = sorted(sites.values(),
+                            key=lambda site: -site["size_kib"])[:self.top]
+
+    def report(self) -> dict:
+        """
+        Returns the report: the peaks, the lines that grew the state the most
+        and the allocation sites that grew the memory the most
+        """
+        lines = sorted(self.lines.items(),
+                       key=lambda item: (-item[1]["peak_state_growth"], -item[
+                           1]["peak_memory_growth_kib"], item[0]))
+        return {
+            "peak_traced_kib":
+            round(self.peak_traced / 1024, 1),
+            "peak_objects":
+            self.objects,
+            "peak_flows_by_pattern":
+            self.patterns,
+            "lines": [{
+                "lineno": lineno,
+                "kind": kind,
+                **entry
+            } for (lineno, kind), entry in lines[:self.top]],
+            "allocation_sites":
+            self.sites
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.report(), indent=4)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+import hashlib
+from ast_cache import ASTCache
+from disk_cache import DiskCache
+from flow_follow import Policy
+from options import Options
+from py_analyser import analyse
+from stats import Stats
+
+# Changes whenever the content of the entries (or the findings of a module)
+# changes
+CACHE_VERSION = 1
+
+
+class ModuleCache(DiskCache):
+    """
+    On-disk cache of the findings of modules, keyed by the hash of their
+    source, of the policy and of the options that change the findings, so
+    that modules with the same content (e.g. copies of the same helpers
+    across a project, or the same files in several scans) are analysed once.
+    Partial findings (a budget was exceeded) aren't cached.
+    """
+
+    name = "module cache"
+
+    def from_options(options: Options) -> ModuleCache:
+        """
+        Returns the cache set by the options (None if there is none)
+        """
+        if options.module_cache is None:
+            return None
+        return ModuleCache(options.module_cache,
+                           options.module_cache_size * 2**20)
+
+    def module_key(self, source: bytes, policy_hash: str,
+                   options: Options) -> str:
+        digest = hashlib.sha256(source)
+        digest.update(policy_hash.encode())
+        digest.update(options.findings_hash().encode())
+        digest.update(f"{CACHE_VERSION}".encode())
+        return digest.hexdigest()
+
+    def analyse(self,
+                source: bytes,
+                policy: Policy,
+                policy_hash: str,
+                options: Options,
+                cache: ASTCache = None) -> tuple[dict, Stats]:
+        """
+        Returns the findings of a module (see `py_analyser.analyse`) from the
+        cache, or analyses it. The statistics of a cached module only have its
+        analysis time (the one it took when it was cached)
+        """
+        key = self.module_key(source, policy_hash, options)
+        entry = self.load(key)
+        if entry is not None:
+            findings, elapsed_ms = entry
+            stats = Stats()
+            stats.incr("module_cache_hits")
+            stats.counters["elapsed_ms"] = elapsed_ms
+            return findings, stats
+
+        findings, stats = analyse(source, policy, options, cache)
+        stats.incr("module_cache_misses")
+        # Slices without sinks are skipped before being parsed, so caching
+        # them wouldn't save anything
+        if stats.budget_exceeded is None and not stats.get(
+                "skipped_by_prefilter"):
+            self.store(key, (findings, stats.get("elapsed_ms")))
+        return findings, stats
@@ -0,0 +1,293 @@
+from __future__ import annotations
+import argparse, hashlib, json, os
+
+# Options that change the findings of a module (the others only change how
+# they are found, or make them partial)
+FINDINGS_OPTIONS = ("max_path_length", "max_flows", "iteration_budget",
+                    "state_budget", "prune_constants", "termination_leak",
+                    "sanitized_flows")
+
+
+class Options:
+    """
+    Tunable parameters of the analysis. By default there is no budget, so the
+    analysis is as precise as it can be.
+    """
+
+    def __init__(self,
+                 max_path_length: int = None,
+                 max_flows: int = None,
+                 time_budget: float = None,
+                 iteration_budget: int = None,
+                 state_budget: int = None,
+                 jobs: int = 1,
+                 slicing: bool = True,
+                 liveness: bool = True,
+                 ast_cache: str = None,
+                 ast_cache_size: int = 256,
+                 loop_memo: bool = True,
+                 block_summaries: bool = True,
+                 prune_constants: bool = False,
+                 two_phase: bool = False,
+                 termination_leak: bool = False,
+                 sanitized_flows: bool = True,
+                 memory_profile: bool = False,
+                 loop_closure: bool = True,
+                 expr_memo: bool = True,
+                 module_cache: str = None,
+                 module_cache_size: int = 256,
+                 pre_analysis: bool = True):
+        # Maximum number of sanitizers tracked (in order) for a single flow.
+        # Longer paths are widened into a summary of the sanitizers used
+        self.max_path_length = max_path_length
+
+        # Maximum number of distinct flows kept for a (variable, pattern)
+        # pair. When exceeded, the sanitized flows of each source are
+        # summarized into a single one
+        self.max_flows = max_flows
+
+        # Resources the analysis of a slice may use: wall time (in seconds),
+        # loop iterations (over all loops) and size of the multilabelling
+        # (number of flows). When one of them is exceeded, the analysis
+        # degrades (see `IFVisitor.check_budgets`) and the findings are partial
+        self.time_budget = time_budget
+        self.iteration_budget = iteration_budget
+        self.state_budget = state_budget
+
+        # Number of processes among which the patterns are split
+        self.jobs = jobs
+
+        # Whether only the backward slice from the sinks is analysed (see
+        # `slicing.slice_tree`)
+        self.slicing = slicing
+
+        # Whether names are removed from the multilabelling once they are dead
+        # (see `dataflow.liveness`)
+        self.liveness = liveness
+
+        # Directory where parsed slices are cached (see `ast_cache.ASTCache`)
+        # and its maximum size (in MiB)
+        self.ast_cache = ast_cache
+        self.ast_cache_size = ast_cache_size
+
+        # Whether the analysis of loops is reused when they are reached again
+        # with the same input (see `loop_memo`)
+        self.loop_memo = loop_memo
+
+        # Whether the blocks of straight-line code in loops are summarized
+        # once and then applied as a whole (see `block_summary`)
+        self.block_summaries = block_summaries
+
+        # Whether the branches that constant conditions rule out are skipped
+        # (see `dataflow.constant_truth`). Off by default, since code after a
+        # `while True:` without breaks is then unreachable, so its sinks are
+        # no longer reported
+        self.prune_constants = prune_constants
+
+        # Whether the slice is first analysed without the order of the
+        # sanitizers (see `py_analyser.analyse_two_phase`), and then again
+        # only for the patterns, sources and sinks of the flows found
+        self.two_phase = two_phase
+
+        # Whether the conditions of loops are part of the context after them
+        # (information leaks through their termination). Set from the
+        # environment (`TERMINATION_LEAK`) on the command line
+        self.termination_leak = termination_leak
+
+        # Whether sanitized flows are tracked. If not, flows are dropped when
+        # they are sanitized (only unsanitized flows are found)
+        self.sanitized_flows = sanitized_flows
+
+        # Whether the memory used by the state is accounted, per statement
+        # and loop iteration (see `memory.MemoryProfile`). Set on the command
+        # line with `--memory-profile`
+        self.memory_profile = memory_profile
+
+        # Whether loops whose body is a single block (see `block_summaries`)
+        # are converged by following only the flows each iteration adds (see
+        # `loop_closure`), instead of analysing the body again
+        self.loop_closure = loop_closure
+
+        # Whether the names and attribute chains read by expressions are
+        # memoized while the state and the context don't change (see
+        # `expr_memo`)
+        self.expr_memo = expr_memo
+
+        # Directory where the findings of whole modules are cached (see
+        # `module_cache.ModuleCache`) and its maximum size (in MiB)
+        self.module_cache = module_cache
+        self.module_cache_size = module_cache_size
+
+        # Whether slices are first screened by a flow-insensitive analysis,
+        # and only analysed if it finds that some sink might be reached (see
+        # `pre_analysis`)
+        self.pre_analysis = pre_analysis
+
+    def __repr__(self) -> str:
+        return f"Options {vars(self)}"
+
+    def has_budget(self) -> bool:
+        """
+        Whether the analysis is bounded (in which case it depends on the
+        number of flows, see `max_flows` and the budgets)
+        """
+        return (self.max_flows is not None or self.time_budget is not None
+                or self.iteration_budget is not None
+                or self.state_budget is not None)
+
+    def findings_options(self) -> dict:
+        """
+        Returns the options that change the findings (see `FINDINGS_OPTIONS`)
+        """
+        return {name: getattr(self, name) for name in FINDINGS_OPTIONS}
+
+    def findings_hash(self) -> str:
+        """
+        Returns the hash of the options that change the findings, so that
+        findings found with other ones aren't reused
+        """
+        return hashlib.sha256(
+            json.dumps(self.findings_options(),
+                       sort_keys=True).encode("utf-8")).hexdigest()
+
+    def add_arguments(parser: argparse.ArgumentParser):
+        """
+        Adds the command line arguments that set the options
+        """
+        parser.add_argument(
+            '--max-path-length',
+            type=int,
+            help=
+            'maximum number of sanitizers tracked in order for each flow (longer paths are reported as approximated)'
+        )
+        parser.add_argument(
+            '--max-flows',
+            type=int,
+            help=
+            'maximum number of flows tracked for each variable and pattern (the sanitized flows of each source are then summarized and reported as approximated)'
+        )
+        parser.add_argument(
+            '--time-budget',
+            type=float,
+            help=
+            'seconds after which the analysis stops (the findings are partial)'
+        )
+        parser.add_argument(
+            '--iteration-budget',
+            type=int,
+            help=
+            'loop iterations after which loops are no longer analysed up to their fixed point'
+        )
+        parser.add_argument(
+            '--state-budget',
+            type=int,
+            help=
+            'number of flows in the state after which flows are summarized and loops are no longer analysed up to their fixed point'
+        )
+        parser.add_argument(
+            '-j',
+            '--jobs',
+            type=int,
+            default=1,
+            help='number of processes among which the patterns are split')
+        parser.add_argument(
+            '--no-slicing',
+            action='store_true',
+            help=
+            'analyse every statement, instead of only the ones the sinks depend on'
+        )
+        parser.add_argument(
+            '--no-liveness',
+            action='store_true',
+            help='keep names in the state after they are last read')
+        parser.add_argument(
+            '--ast-cache',
+            metavar='DIR',
+            help=
+            'cache the parsed slices in DIR (reused across runs and patterns)')
+        parser.add_argument(
+            '--ast-cache-size',
+            type=int,
+            default=256,
+            metavar='MIB',
+            help=
+            'maximum size of the AST cache, the least recently used slices are evicted'
+        )
+        parser.add_argument(
+            '--module-cache',
+            metavar='DIR',
+            help=
+            'cache the findings of each module in DIR, so files with the same content are analysed once (only used by scans)'
+        )
+        parser.add_argument(
+            '--module-cache-size',
+            type=int,
+            default=256,
+            metavar='MIB',
+            help=
+            'maximum size of the module cache, the least recently used modules are evicted'
+        )
+        parser.add_argument(
+            '--no-loop-memo',
+            action='store_true',
+            help=
+            'analyse loops again even when they are reached with the same input'
+        )
+        parser.add_argument(
+            '--no-block-summaries',
+            action='store_true',
+            help=
+            'analyse the straight-line code in loops statement by statement on every iteration'
+        )
+        parser.add_argument(
+            '--no-loop-closure',
+            action='store_true',
+            help=
+            'converge loops by analysing their body on every iteration, instead of following the flows each iteration adds'
+        )
+        parser.add_argument(
+            '--no-expr-memo',
+            action='store_true',
+            help=
+            'evaluate every read of a name or attribute chain, instead of reusing the ones of the same state and context'
+        )
+        parser.add_argument(
+            '--no-pre-analysis',
+            action='store_true',
+            help=
+            'analyse every slice, instead of only the ones where a flow-insensitive pre-analysis finds that some sink might be reached'
+        )
+        parser.add_argument(
+            '--prune-constants',
+            action='store_true',
+            help=
+            'skip the branches ruled out by constant conditions (e.g. `if False:`), code after `while True:` without breaks is unreachable'
+        )
+        parser.add_argument(
+            '--two-phase',
+            action='store_true',
+            help=
+            'find the flows without the order of the sanitizers first, and only track it for the flows found (ignored with budgets)'
+        )
+
+    def from_args(args) -> Options:
+        return Options(args.max_path_length,
+                       args.max_flows,
+                       args.time_budget,
+                       args.iteration_budget,
+                       args.state_budget,
+                       args.jobs,
+                       not args.no_slicing,
+                       not args.no_liveness,
+                       args.ast_cache,
+                       args.ast_cache_size,
+                       not args.no_loop_memo,
+                       not args.no_block_summaries,
+                       args.prune_constants,
+                       args.two_phase,
+                       'TERMINATION_LEAK' in os.environ,
+                       loop_closure=not args.no_loop_closure,
+                       expr_memo=not args.no_expr_memo,
+                       module_cache=args.module_cache,
+                       module_cache_size=args.module_cache_size,
+                       pre_analysis=not args.no_pre_analysis)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+import ast, logging
+from concurrent.futures import ProcessPoolExecutor
+from flow_follow import *
+from options import Options
+from stats import Stats
+import IFVisitor as ifv
+
+
+def partition(policy: Policy, groups: int) -> list[list[Pattern]]:
+    """
+    Splits the patterns of the policy in (at most) `groups` groups of
+    similar size
+    """
+    parts = [policy.patterns[i::groups] for i in range(groups)]
+    return [part for part in parts if part]
+
+
+def analyse_group(tree: ast.Module, patterns: list[Pattern],
+                  options: Options) -> tuple[dict, list, Stats]:
+    """
+    Analyses a slice for a group of patterns (runs in a worker process).
+    Returns the findings, the sinks in the order they were reached and the
+    statistics of the analysis.
+    """
+    vulns = Vulnerability({})
+    vis = ifv.IFVisitor(options)
+    vis.visit(tree, Policy(patterns), MultiLabelling({}), vulns)
+
+    sinks = [(sink.name, sink.lineno) for sink in vulns.illegal_flows]
+    return vulns.findings(), sinks, vis.stats
+
+
+def merge(results: list[tuple[dict, list, Stats]],
+          policy: Policy) -> tuple[dict, Stats]:
+    """
+    Merges the results of the groups into the findings (and statistics) that
+    analysing all the patterns at once would produce. The patterns are
+    independent, so only the order of the findings (see
+    `Vulnerability.findings`) has to be restored.
+    """
+    # Sinks are reached in the same order, whatever the patterns
+    sink_order = {}
+    for _, sinks, _ in results:
+        for sink in sinks:
+            sink_order.setdefault(sink, len(sink_order))
+
+    pattern_order = {
+        name: i
+        for i, name in enumerate(policy.get_vulnerabilities())
+    }
+
+    merged = {}
+    stats = Stats()
+    for findings, _, part_stats in results:
+        merged.update(findings)
+        stats.merge(part_stats)
+
+    # Stable, so each group keeps the order of the sources
+    keys = sorted(merged,
+                  key=lambda key: (sink_order[key[1]], pattern_order[key[2]]))
+    return {key: merged[key] for key in keys}, stats
+
+
+def analyse_parallel(tree: ast.Module, policy: Policy,
+                     options: Options) -> tuple[dict, Stats]:
+    """
+    Analyses a slice with the patterns of the policy split among
+    `options.jobs` worker processes
+    """
+    groups = partition(policy, options.jobs)
+    logging.info(f"Analysing {len(groups)} groups of patterns in parallel")
+
+    with ProcessPoolExecutor(max_workers=len(groups)) as executor:
+        futures = [
+            executor.submit(analyse_group, tree, group, options)
+            for group in groups
+        ]
+        results = [future.result() for future in futures]
+
+    return merge(results, policy)
@@ -0,0 +1,248 @@
+from __future__ import annotations
+import ast, logging
+from flow_follow import Policy
+import IFVisitor as ifv
+
+# Node of the context of the conditions (see `FlowUnion`)
+CONTEXT = ("context", )
+
+
+class FlowUnion:
+    """
+    Flow-insensitive over-approximation of the analysis of a (sliced) module,
+    which only tells which patterns each value might have flows of. Each name
+    is the union of everything ever assigned to it (in any order, on any
+    path), sanitizers are ignored (sanitized flows are findings too) and the
+    context of every condition flows into every value. The values are the
+    edges of a graph between the names, the context and the sinks, whose
+    fixed point is found in time linear in its size (times the number of
+    patterns, see `reaches_sink`). If no sink might be reached by a flow of
+    one of its patterns, `IFVisitor` can't find any illegal flow either.
+    """
+
+    def __init__(self, policy: Policy):
+        self.policy = policy
+        self.every = set(policy.get_vulnerabilities())
+        self.implicit = set(policy.get_implicit_vulnerabilities())
+
+        # Edges of the graph: the node a value flows into (a name, the context
+        # or the index of a sink), the names it reads and the patterns of the
+        # sources it adds
+        self.edges = []
+
+        # Patterns for which each sink (call or assignment target) is one
+        self.sinks = []
+
+    def of(tree: ast.Module, policy: Policy) -> FlowUnion:
+        """
+        Returns the graph of a module (raises ValueError for the statements
+        and expressions that `IFVisitor` doesn't analyse, so that the module
+        is analysed, and the error reported, as usual)
+        """
+        union = FlowUnion(policy)
+        union.block(tree.body, set())
+        return union
+
+    def read(self, name: str, defined: set[str], value: tuple[set, set]):
+        names, patterns = value
+        if name in defined:
+            names.add(name)
+            patterns.update(self.policy.search_source(name))
+        else:
+            # Names that might not be assigned yet are sources for every
+            # pattern (see `IFVisitor.visit_name`)
+            patterns.update(self.every)
+
+    def sink(self, name: str, value: tuple[set, set]):
+        patterns = self.policy.search_sink(name)
+        if patterns:
+            self.sinks.append(set(patterns))
+            self.edges.append((len(self.sinks) - 1, ) + value)
+
+    def expression(self, node: ast.AST, defined: set[str]) -> tuple[set, set]:
+        """
+        Returns the value of an expression: the names it reads and the
+        patterns of the sources it adds (and adds the edges of the calls of
+        sinks in it). Operands are handled on an explicit stack, so deep
+        expressions don't recurse (see `IFVisitor.evaluate`)
+        """
+        value = (set(), set())
+        # The values of the arguments of the calls are added to the one of the
+        # expression they are in once they are complete (innermost last)
+        calls = []
+        stack = [(node, value)]
+        while stack:
+            node, into = stack.pop()
+            if type(node) == ast.Constant:
+                continue
+            elif type(node) == ast.Name:
+                self.read(node.id, defined, into)
+            elif type(node) == ast.Attribute:
+                # Attributes are read as names (see `IFVisitor.evaluate`)
+                self.read(node.attr, defined, into)
+                stack.append((node.value, into))
+            elif type(node) == ast.Call:
+                try:
+                    flat_nodes = ifv.IFVisitor.flat_vars(node)
+                except AssertionError:
+                    raise ValueError("call of a non attribute chain")
+                for flat_node in flat_nodes:
+                    if type(flat_node) == ast.Name:
+                        self.read(flat_node.id, defined, into)
+                        continue
+                    if type(flat_node.func) != ast.Name:
+                        raise ValueError(
+                            f"call of {type(flat_node.func).__name__}")
+                    name = flat_node.func.id
+                    args = (set(), set(self.policy.search_source(name)))
+                    self.sink(name, args)
+                    calls.append((args, into))
+                    stack += [(arg, args) for arg in flat_node.args]
+            elif type(node) == ast.BinOp:
+                stack += [(node.left, into), (node.right, into)]
+            elif type(node) == ast.UnaryOp:
+                stack.append((node.operand, into))
+            elif type(node) in (ast.BoolOp, ast.Compare):
+                operands = node.values if type(
+                    node) == ast.BoolOp else [node.left] + node.comparators
+                stack += [(operand, into) for operand in operands]
+            else:
+                raise ValueError(f"expression {type(node).__name__}")
+
+        for (names, patterns), (into_names, into_patterns) in reversed(calls):
+            into_names |= names
+            into_patterns |= patterns
+        return value
+
+    def assign(self, targets: list[ast.AST], value: tuple[set, set],
+               defined: set[str]):
+        """
+        Adds the edges of an assignment, and the names it assigns (the
+        rightmost of each target, see `IFVisitor.visit_assign`) to the defined
+        """
+        rightmost_targets = []
+        for target in targets:
+            try:
+                flattened = [
+                    flat_node.id
+                    for flat_node in ifv.IFVisitor.flat_vars(target)
+                    if type(flat_node) == ast.Name
+                ]
+            except AssertionError:
+                raise ValueError(f"assignment to {type(target).__name__}")
+            if not flattened:
+                raise ValueError("assignment to a call")
+
+            # The names on the left of the rightmost one are added to, and
+            # all of them might be sinks
+            for name in flattened:
+                self.edges.append((name, ) + value)
+                self.sink(name, value)
+            rightmost_targets.append(flattened[-1])
+        defined.update(rightmost_targets)
+
+    def condition(self, value: tuple[set, set]):
+        self.edges.append((CONTEXT, ) + value)
+
+    def block(self, stmts: list[ast.stmt], defined: set[str]):
+        """
+        Adds the edges of a block, given the names assigned on every path to
+        it (whose reads don't add sources for every pattern). The names the
+        block assigns are added to them.
+        """
+        for stmt in stmts:
+            if type(stmt) == ast.Expr:
+                self.expression(stmt.value, defined)
+
+            elif type(stmt) == ast.Assign:
+                self.assign(stmt.targets, self.expression(stmt.value, defined),
+                            defined)
+
+            elif type(stmt) == ast.AugAssign:
+                # `target op= value` is `target = value op target`
+                names, patterns = self.expression(stmt.value, defined)
+                target_names, target_patterns = self.expression(
+                    stmt.target, defined)
+                self.assign([stmt.target],
+                            (names | target_names, patterns | target_patterns),
+                            defined)
+
+            elif type(stmt) == ast.If:
+                self.condition(self.expression(stmt.test, defined))
+                taken = set(defined)
+                self.block(stmt.body, taken)
+                not_taken = set(defined)
+                self.block(stmt.orelse, not_taken)
+                defined.update(taken & not_taken)
+
+            elif type(stmt) == ast.While:
+                # The `else` of loops isn't analysed (see
+                # `IFVisitor.iterate_while`)
+                self.condition(self.expression(stmt.test, defined))
+                self.block(stmt.body, set(defined))
+
+            elif type(stmt) == ast.For:
+                # Analysed as `while not iter: target = iter; body` (see
+                # `IFVisitor.visit_for`)
+                value = self.expression(stmt.iter, defined)
+                self.condition(value)
+                body = set(defined)
+                self.assign([stmt.target], value, body)
+                self.block(stmt.body, body)
+
+            elif type(stmt) in (ast.Break, ast.Continue):
+                # The rest of the block isn't reached
+                return
+
+            elif type(stmt) != ast.Pass:
+                raise ValueError(f"statement {type(stmt).__name__}")
+
+    def reaches_sink(self) -> bool:
+        """
+        Returns whether some sink might be reached by a flow of one of its
+        patterns. The patterns of each node only grow, and each time they do
+        the edges that read it are followed again
+        """
+        flows = {}
+        readers = {}
+        reached = []
+        for edge in self.edges:
+            target, names, patterns = edge
+            for name in names:
+                readers.setdefault(name, []).append(edge)
+            if patterns:
+                reached.append((target, patterns))
+
+        while reached:
+            target, patterns = reached.pop()
+            if target == CONTEXT:
+                patterns = patterns & self.implicit
+            if type(target) == int:
+                if patterns & self.sinks[target]:
+                    return True
+                continue
+
+            new = patterns - flows.get(target, set())
+            if not new:
+                continue
+            flows.setdefault(target, set()).update(new)
+            # Every value is evaluated in the context
+            for edge in self.edges if target == CONTEXT else readers.get(
+                    target, ()):
+                reached.append((edge[0], new))
+        return False
+
+
+def screen(tree: ast.Module, policy: Policy) -> str:
+    """
+    Returns the decision of the first tier on a (sliced) module: "clean" if
+    it can't have findings, so `IFVisitor` doesn't have to analyse it, or else
+    "escalated" (or "unsupported", if it has statements or expressions that
+    `FlowUnion` doesn't handle)
+    """
+    try:
+        union = FlowUnion.of(tree, policy)
+    except ValueError as e:
+        logging.debug(f"Escalated without pre-analysis: {e}")
+        return "unsupported"
+    return "escalated" if union.reaches_sink() else "clean"
@@ -1,13 +1,24 @@
-import ast, sys, argparse, json
+import ast, copy, os, sys, argparse, json, time
 import IFVisitor as ifv
 from flow_follow import *
+from options import Options
+from ast_cache import ASTCache, Parsed
+from relevance import may_reach_sink, reached_policy, restrict_policy
+from slicing import slice_tree, count_statements
+from stats import Stats
+from parallel import analyse_parallel
+from pre_analysis import screen
+from gate import Gate, GateTripped, STATUSES
 import logging
 
 
+def load_source(filename: str) -> bytes:
+    with open(filename, 'rb') as fh:
+        return fh.read()
+
+
 def load_tree(filename: str) -> ast.AST:
-    with open(filename, 'r') as fh:
-        source = fh.read()
-        return ast.parse(source)
+    return ast.parse(load_source(filename))
 
 
 def load_policy(filename: str) -> Policy:
@@ -21,17 +32,328 @@ def load_policy(filename: str) -> Policy:
     return Policy(patterns)
 
 
-def main(slice: str, patterns: str):
-    tree = load_tree(slice)
-    policy = load_policy(patterns)
+def load_policies(
+        filenames: list[str]) -> tuple[Policy, dict[str, tuple[str, str]]]:
+    """
+    Loads several policy files into a single policy, so that the slice is
+    analysed once for all of them. Pattern names are prefixed by the name of
+    their file (so patterns of different files can't collide), followed by a
+    number if another file has the same name. Returns the policy and the file
+    and original name of each (prefixed) pattern. Raises ValueError if a file
+    is given more than once.
+    """
+    patterns = []
+    origins = {}
+    namespaces = set()
+    paths = set()
+    for filename in filenames:
+        path = os.path.realpath(filename)
+        if path in paths:
+            raise ValueError(f"{filename} is given more than once")
+        paths.add(path)
+
+        name = os.path.basename(filename).split('.')[0]
+        namespace, i = name, 1
+        while namespace in namespaces:
+            i += 1
+            namespace = f"{name}-{i}"
+        namespaces.add(namespace)
+
+        for pattern in load_policy(filename).patterns:
+            name = f"{namespace}/{pattern.name}"
+            origins[name] = (filename, pattern.name)
+            patterns.append(
+                Pattern(name, pattern.sources, pattern.sanitizers,
+                        pattern.sinks, pattern.implicit))
+
+    return Policy(patterns), origins
+
+
+def split_findings(findings: dict[tuple, tuple[list, bool]],
+                   origins: dict[str, tuple[str, str]]) -> dict[str, dict]:
+    """
+    Splits the findings of a policy loaded from several files (see
+    `load_policies`) into the findings of each file, with the original
+    pattern names
+    """
+    split = {filename: {} for filename, _ in origins.values()}
+    for key in findings:
+        src, sink, name = key
+        filename, pattern = origins[name]
+        split[filename][(src, sink, pattern)] = findings[key]
+    return split
+
+
+def print_findings(findings: dict[tuple, tuple[list, bool]],
+                   patterns: list[str], origins: dict[str, tuple[str, str]]):
+    """
+    Prints the findings of an analysis. With several policy files, the
+    findings of each of them, as if it was analysed alone (see
+    `split_findings`)
+    """
+    if len(patterns) == 1:
+        print(Vulnerability.findings_to_json(findings))
+        return
+
+    split = split_findings(findings, origins)
+    print(
+        json.dumps(
+            {
+                filename: Vulnerability.findings_to_list(split[filename])
+                for filename in split
+            },
+            indent=4))
+
+
+def write_stats(stats: Stats, filename: str):
+    if filename is not None:
+        with open(filename, 'w') as fh:
+            fh.write(stats.to_json())
+
+
+def analyse(source: bytes,
+            policy: Policy,
+            options: Options,
+            cache: ASTCache = None,
+            vulns: Vulnerability = None) -> tuple[dict, Stats]:
+    """
+    Analyses a slice (given its source code) and returns its findings (see
+    `Vulnerability.findings`) and the statistics of the analysis. The slice
+    is parsed through the cache, if given. The illegal flows are collected in
+    `vulns`, if given (e.g. a `Gate`), in which case the analysis is
+    sequential.
+    """
+    if not may_reach_sink(source, policy):
+        # No sink is mentioned, so there can't be any illegal flow
+        logging.info("Skipped slice (no sink is mentioned)")
+        skipped = Stats()
+        skipped.incr("skipped_by_prefilter")
+        return {}, skipped
+
+    if cache is not None:
+        parsed, hit = cache.parse(source)
+    else:
+        parsed, hit = Parsed(ast.parse(source)), None
+
+    findings, analysis_stats = analyse_parsed(parsed, policy, options, vulns)
+    if hit is not None:
+        analysis_stats.incr("ast_cache_hits" if hit else "ast_cache_misses")
+    return findings, analysis_stats
+
+
+def analyse_parsed(parsed: Parsed,
+                   policy: Policy,
+                   options: Options,
+                   vulns: Vulnerability = None) -> tuple[dict, Stats]:
+    """
+    Analyses a parsed slice (see `analyse`). Nothing is shared between calls
+    (the policy and the tree are only read), so slices can be analysed
+    concurrently.
+    """
+    tree = parsed.tree
+
+    # Only the patterns whose sinks occur in the slice can have findings
+    sliced = restrict_policy(parsed.candidates, policy)
+    logging.info(
+        f"Tracking {len(sliced.patterns)} of {len(policy.patterns)} patterns")
+
+    statements = parsed.statements
+    if options.slicing and sliced.patterns:
+        # Only the statements the sinks depend on can change the findings
+        tree = slice_tree(tree, sliced, options.termination_leak)
+        logging.info(
+            f"Analysing {count_statements(tree)} of {statements} statements")
+
+    start = time.monotonic()
+    # Most slices have no findings, which a cheap flow-insensitive first tier
+    # can often tell (see `pre_analysis`)
+    tier = None
+    if options.pre_analysis and sliced.patterns:
+        tier = screen(tree, sliced)
+        logging.info(f"Pre-analysis: {tier}")
+
+    # Budgets make the analysis depend on every flow, so it can't be split in
+    # phases (see `analyse_two_phase`)
+    two_phase = options.two_phase and not options.has_budget()
+    if tier == "clean":
+        findings, analysis_stats = {}, Stats()
+    elif vulns is None and two_phase and sliced.patterns:
+        findings, analysis_stats, tree = analyse_two_phase(
+            parsed.tree, tree, sliced, options)
+    else:
+        findings, analysis_stats = run(tree, sliced, options, vulns)
+
+    if tier is not None:
+        analysis_stats.incr(f"pre_analysis_{tier}")
+    analysis_stats.counters["patterns"] = len(policy.patterns)
+    analysis_stats.counters["patterns_tracked"] = len(sliced.patterns)
+    analysis_stats.counters["statements"] = statements
+    analysis_stats.counters["statements_analysed"] = count_statements(tree)
+    analysis_stats.counters["elapsed_ms"] = round(
+        (time.monotonic() - start) * 1000)
+    return findings, analysis_stats
+
+
+def run(tree: ast.Module,
+        policy: Policy,
+        options: Options,
+        vulns: Vulnerability = None) -> tuple[dict, Stats]:
+    """
+    Analyses a (sliced) tree, splitting the patterns among processes if
+    possible (see `analyse`)
+    """
+    if vulns is None and options.jobs > 1 and len(policy.patterns) > 1:
+        return analyse_parallel(tree, policy, options)
 
     mtlb = MultiLabelling({})
-    vulns = Vulnerability()
+    if vulns is None:
+        vulns = Vulnerability()
+
+    vis = ifv.IFVisitor(options)
+    if policy.patterns:
+        try:
+            vis.visit(tree, policy, mtlb, vulns)
+        except GateTripped:
+            logging.info("Stopped analysis (gate tripped)")
+            vis.stats.incr("gate_tripped")
+    return vulns.findings(), vis.stats
+
+
+def analyse_two_phase(module: ast.Module, tree: ast.Module, policy: Policy,
+                      options: Options) -> tuple[dict, Stats, ast.Module]:
+    """
+    Analyses a (sliced) tree in two phases. The first one only tracks which
+    sanitizers each flow might have gone through (all paths are widened, see
+    `WidenedPath`), which is enough to tell which flows there are. The second
+    one tracks the order of the sanitizers, but only for the patterns,
+    sources and sinks of the flows found (the rest of the module is sliced
+    away), so slices without findings are only analysed cheaply. Returns the
+    findings, the statistics and the tree analysed last.
+    """
+    screening = copy.copy(options)
+    screening.max_path_length = 0
+    findings, stats = run(tree, policy, screening)
+    stats.incr("phases")
+    if not findings:
+        return findings, stats, tree
+
+    reached = reached_policy(findings, policy)
+    logging.info(
+        f"Tracking sanitization paths for {len(reached.patterns)} of {len(policy.patterns)} patterns"
+    )
+    if options.slicing:
+        tree = slice_tree(module, reached, options.termination_leak)
+    findings, exact = run(tree, reached, options)
+    exact.merge(stats)
+    exact.incr("phases")
+    exact.counters["patterns_reached"] = len(reached.patterns)
+    return findings, exact, tree
+
+
+def write_memory_profile(stats: Stats, filename: str):
+    if filename is not None and stats.memory is not None:
+        with open(filename, 'w') as fh:
+            fh.write(stats.memory.to_json())
+
+
+def main(slice: str,
+         patterns: list[str],
+         options: Options,
+         stats: str = None,
+         memory_profile: str = None) -> int:
+    """
+    Analyses a slice and prints its findings. Returns the exit code: 2 if the
+    policy files can't be loaded, 0 otherwise
+    """
+    cache = ASTCache.from_options(options)
+
+    if len(patterns) == 1:
+        policy, origins = load_policy(patterns[0]), None
+    else:
+        try:
+            policy, origins = load_policies(patterns)
+        except ValueError as e:
+            print(f"py_analyser: {e}", file=sys.stderr)
+            return 2
 
-    vis = ifv.IFVisitor()
-    ifresult = vis.visit(tree, policy, mtlb, vulns)
+    findings, analysis_stats = analyse(load_source(slice), policy, options,
+                                       cache)
 
-    print(vulns.to_json())
+    print_findings(findings, patterns, origins)
+    if len(patterns) > 1:
+        analysis_stats.counters["policies"] = len(patterns)
+
+    if analysis_stats.budget_exceeded is not None:
+        budget, lineno = analysis_stats.budget_exceeded
+        print(
+            f"py_analyser: {budget} budget exceeded at line {lineno}, the findings are partial",
+            file=sys.stderr)
+
+    write_stats(analysis_stats, stats)
+    write_memory_profile(analysis_stats, memory_profile)
+    return 0
+
+
+def gate(slice: str,
+         patterns: list[str],
+         options: Options,
+         gate_patterns: list[str],
+         status: str,
+         stats: str = None) -> int:
+    """
+    Analyses a slice only until the first illegal flow of the given patterns
+    (all if none is given) and status (see `Gate`), and prints it. Returns the
+    exit code: 1 if there is such a flow, 0 if there is none and 2 if that
+    can't be told (the analysis is partial)
+    """
+    cache = ASTCache.from_options(options)
+
+    if len(patterns) == 1:
+        policy = load_policy(patterns[0])
+        origins = {
+            name: (patterns[0], name)
+            for name in policy.get_vulnerabilities()
+        }
+    else:
+        try:
+            policy, origins = load_policies(patterns)
+        except ValueError as e:
+            print(f"py_analyser: {e}", file=sys.stderr)
+            return 2
+
+    if gate_patterns:
+        # Patterns are given by their name in their file, or by their
+        # prefixed name (see `load_policies`)
+        for name in gate_patterns:
+            if not any(name in (pattern, origins[pattern][1])
+                       for pattern in origins):
+                print(f"py_analyser: unknown pattern {name}", file=sys.stderr)
+                return 2
+        policy = Policy([
+            pattern for pattern in policy.patterns
+            if pattern.name in gate_patterns
+            or origins[pattern.name][1] in gate_patterns
+        ])
+
+    if status == "unsanitized":
+        # Sanitized flows can never qualify, so they aren't tracked
+        options.sanitized_flows = False
+
+    collector = Gate(status)
+    findings, analysis_stats = analyse(load_source(slice), policy, options,
+                                       cache, collector)
+    print_findings(findings, patterns, origins)
+    write_stats(analysis_stats, stats)
+
+    if collector.tripped is not None:
+        return 1
+    if analysis_stats.budget_exceeded is not None:
+        budget, lineno = analysis_stats.budget_exceeded
+        print(
+            f"py_analyser: {budget} budget exceeded at line {lineno}, the gate can't tell if there is a finding",
+            file=sys.stderr)
+        return 2
+    return 0
 
 
 if __name__ == "__main__":
@@ -45,7 +367,45 @@ if __name__ == "__main__":
     )
 
     parser.add_argument('slice')
-    parser.add_argument('patterns')
+    parser.add_argument(
+        'patterns',
+        nargs='+',
+        help=
+        'policy files (with several, the findings are reported for each of them)'
+    )
+    Options.add_arguments(parser)
+    parser.add_argument('--stats',
+                        metavar='FILE',
+                        help='write statistics about the analysis to FILE')
+    parser.add_argument(
+        '--memory-profile',
+        metavar='FILE',
+        help=
+        'account the memory used by the state of the analysis and write the lines and allocation sites that grew it the most to FILE'
+    )
+    parser.add_argument(
+        '--gate',
+        action='store_true',
+        help=
+        'stop at the first finding, which is printed, and exit with 1 if there is one'
+    )
+    parser.add_argument(
+        '--gate-pattern',
+        action='append',
+        metavar='NAME',
+        help='only findings of this pattern fail the gate (can be repeated)')
+    parser.add_argument('--gate-status',
+                        choices=STATUSES,
+                        default='any',
+                        help='only findings with such a flow fail the gate')
     args = parser.parse_args()
+    options = Options.from_args(args)
+    options.memory_profile = args.memory_profile is not None
 
-    main(args.slice, args.patterns)
+    if args.gate:
+        sys.exit(
+            gate(args.slice, args.patterns, options, args.gate_pattern,
+                 args.gate_status, args.stats))
+    sys.exit(
+        main(args.slice, args.patterns, options, args.stats,
+             args.memory_profile))
@@ -0,0 +1,120 @@
+from __future__ import annotations
+import ast, re, unicodedata, importlib.util, weakref
+from flow_follow import Pattern, Policy
+
+# Maps policies to the matcher of their sinks
+_sink_matchers = weakref.WeakKeyDictionary()
+
+
+def sink_matcher(policy: Policy) -> re.Pattern:
+    """
+    Returns a regular expression (over bytes) that matches any sink of the
+    policy as a whole identifier. It is compiled once for each policy.
+    """
+    if policy not in _sink_matchers:
+        sinks = sorted({sink
+                        for p in policy.patterns
+                        for sink in p.sinks},
+                       key=len,
+                       reverse=True)
+        if not sinks:
+            # Matches nothing
+            matcher = re.compile(rb"(?!)")
+        else:
+            alternation = b"|".join(
+                re.escape(sink.encode("utf-8")) for sink in sinks)
+            matcher = re.compile(rb"(?<!\w)(?:" + alternation + rb")(?!\w)")
+        _sink_matchers[policy] = matcher
+
+    return _sink_matchers[policy]
+
+
+def may_reach_sink(source: bytes, policy: Policy) -> bool:
+    """
+    Returns whether some sink of the policy might be used in the (raw) source
+    code. If not, the analysis can't find any illegal flow, so the file can
+    be skipped without being parsed.
+    """
+    matcher = sink_matcher(policy)
+    if matcher.search(source) is not None:
+        return True
+
+    if source.isascii():
+        return False
+
+    # Python normalizes identifiers (NFKC), so a sink might be written with
+    # other characters
+    text = importlib.util.decode_source(source)
+    normalized = unicodedata.normalize("NFKC", text).encode("utf-8")
+    return matcher.search(normalized) is not None
+
+
+def sink_candidates(tree: ast.AST) -> set[str]:
+    """
+    Returns the names that the analysis might check as sinks: the names of
+    called functions and the names in assignment targets (including the ones
+    in attribute chains)
+    """
+    names = set()
+    for node in ast.walk(tree):
+        if type(node) == ast.Call:
+            if type(node.func) == ast.Name:
+                names.add(node.func.id)
+            elif type(node.func) == ast.Attribute:
+                names.add(node.func.attr)
+
+        targets = []
+        if type(node) == ast.Assign:
+            targets = node.targets
+        elif type(node) in (ast.AugAssign, ast.For):
+            targets = [node.target]
+
+        for target in targets:
+            for el in ast.walk(target):
+                if type(el) == ast.Name:
+                    names.add(el.id)
+                elif type(el) == ast.Attribute:
+                    names.add(el.attr)
+
+    return names
+
+
+def restrict_policy(names: set[str], policy: Policy) -> Policy:
+    """
+    Returns the policy restricted to the patterns with some sink among the
+    names (see `sink_candidates`). The patterns are independent from each
+    other, so the findings for the remaining patterns are the same, while the
+    other ones can't have any finding.
+    """
+    return Policy([
+        pattern for pattern in policy.patterns
+        if any(sink in names for sink in pattern.sinks)
+    ])
+
+
+def reached_policy(findings: dict[tuple, tuple[list, bool]],
+                   policy: Policy) -> Policy:
+    """
+    Returns the policy restricted to the patterns, sources, sinks and
+    sanitizers of the findings (see `Vulnerability.findings`). Flows from each
+    source (and through each sanitizer) are independent from the other ones,
+    so the findings for them are the same.
+    """
+    sources = {}
+    sinks = {}
+    sanitizers = {}
+    for (src, sink, pattern), (traces, _) in findings.items():
+        sources.setdefault(pattern, set()).add(src[0])
+        sinks.setdefault(pattern, set()).add(sink[0])
+        sanitizers.setdefault(pattern, set()).update(name for trace in traces
+                                                     for name, _ in trace)
+
+    def kept(names: list[str], found: set[str]) -> list[str]:
+        return [name for name in names if name in found]
+
+    return Policy([
+        Pattern(p.name, kept(p.sources, sources[p.name]),
+                kept(p.sanitizers, sanitizers[p.name]),
+                kept(p.sinks, sinks[p.name]), p.implicit)
+        for p in policy.patterns if p.name in sinks
+    ])
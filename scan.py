@@ -0,0 +1,128 @@
+from __future__ import annotations
+import argparse, hashlib, logging, os
+from ast_cache import ASTCache
+from findings_db import FindingsDB
+from module_cache import ModuleCache
+from options import Options
+from py_analyser import analyse, load_policy, load_source
+
+
+def python_files(paths: list[str]) -> list[str]:
+    """
+    Returns the python files given or found (recursively) in the
+    directories given, in a stable order
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                files += [
+                    os.path.join(root, name) for name in sorted(names)
+                    if name.endswith(".py")
+                ]
+        else:
+            files.append(path)
+    return files
+
+
+def digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def scan(paths: list[str],
+         patterns: str,
+         options: Options,
+         db: FindingsDB,
+         cache: ASTCache = None,
+         modules: ModuleCache = None) -> tuple[int, int, int]:
+    """
+    Analyses the python files in the paths and records their findings in the
+    database, skipping the files whose content, policy and options didn't
+    change since their complete findings were recorded. The findings of files
+    whose content was already analysed (under another path or in another
+    scan) are taken from the module cache, if given. Files that can't be read,
+    parsed or analysed are recorded as failed, and the scan goes on. Returns
+    the number of files analysed, skipped and failed.
+    """
+    policy = load_policy(patterns)
+    with open(patterns, 'rb') as fh:
+        policy_hash = digest(fh.read())
+    options_hash = options.findings_hash()
+
+    analysed = skipped = failed = 0
+    try:
+        for path in python_files(paths):
+            # Files that can't be read are recorded without a hash
+            hash = ""
+            try:
+                source = load_source(path)
+                hash = digest(source)
+                if db.is_current(path, hash, policy_hash, options_hash):
+                    skipped += 1
+                    continue
+
+                logging.info(f"Scanning {path}")
+                if modules is not None:
+                    findings, stats = modules.analyse(source, policy,
+                                                      policy_hash, options,
+                                                      cache)
+                else:
+                    findings, stats = analyse(source, policy, options, cache)
+            except (OSError, ValueError, SyntaxError, UnicodeDecodeError) as e:
+                logging.warning(f"Failed to analyse {path}: {e}")
+                db.record_failure(path, hash, policy_hash, options_hash,
+                                  f"{type(e).__name__}: {e}")
+                failed += 1
+                continue
+            db.record(path, hash, policy_hash, options_hash, findings,
+                      stats.get("elapsed_ms"), stats.budget_exceeded
+                      is not None)
+            analysed += 1
+    finally:
+        # The files recorded so far are kept even if the scan is interrupted
+        db.commit()
+    return analysed, skipped, failed
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, filename="log.log", filemode="w")
+
+    parser = argparse.ArgumentParser(
+        prog='scan',
+        description=
+        'analyses the python files in the given paths and stores the findings in a database (see findings_db.py)'
+    )
+    parser.add_argument('patterns')
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--db',
+                        required=True,
+                        metavar='FILE',
+                        help='SQLite database where the findings are stored')
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=100,
+        help='number of files whose findings are written in each transaction')
+    Options.add_arguments(parser)
+    args = parser.parse_args()
+
+    options = Options.from_args(args)
+    cache = ASTCache.from_options(options)
+    modules = ModuleCache.from_options(options)
+
+    db = FindingsDB(args.db, args.batch_size)
+    analysed, skipped, failed = scan(args.paths, args.patterns, options, db,
+                                     cache, modules)
+    db.close()
+    print(
+        f"scan: {analysed} files analysed, {skipped} unchanged, {failed} failed"
+    )
+    if cache is not None:
+        print(
+            f"scan: AST cache {cache.hits} hits, {cache.misses} misses, {cache.evictions} evictions"
+        )
+    if modules is not None:
+        print(
+            f"scan: module cache {modules.hits} hits, {modules.misses} misses, {modules.evictions} evictions"
+        )
@@ -0,0 +1,380 @@
+from __future__ import annotations
+import argparse, json, logging, os, sys, tempfile
+from ast_cache import ASTCache
+from findings_db import FindingsDB
+from flow_follow import Vulnerability
+from module_cache import ModuleCache
+from options import Options
+from py_analyser import analyse, load_policy, load_source
+from scan import digest, python_files
+
+# Version of the manifest and partial results formats
+VERSION = 2
+
+
+def write_json(filename: str, content: dict):
+    """
+    Writes a file atomically (through a temporary file in the same
+    directory), so that other nodes never read a partial one
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, 'w') as fh:
+        json.dump(content, fh, indent=4)
+    os.replace(tmp, filename)
+
+
+def read_json(filename: str) -> dict:
+    with open(filename, 'r') as fh:
+        return json.load(fh)
+
+
+def balance(costs: dict[str, int], shards: int) -> list[list[str]]:
+    """
+    Splits the files among (at most) `shards` shards of similar cost: the most
+    costly files first, each to the cheapest shard so far. Ties are broken by
+    path and shard number, so the split only depends on the costs. Files are
+    kept in order (by path) in each shard.
+    """
+    parts = [[] for _ in range(shards)]
+    totals = [0] * shards
+    for path in sorted(costs, key=lambda path: (-costs[path], path)):
+        i = min(range(shards), key=lambda i: (totals[i], i))
+        parts[i].append(path)
+        totals[i] += costs[path]
+    return [sorted(part) for part in parts if part]
+
+
+def estimate_costs(files: list[str], history: dict[str,
+                                                   int]) -> dict[str, int]:
+    """
+    Returns the cost of analysing each file: the time its last analysis
+    took, if known, or else its size scaled by the time per byte of the files
+    whose time is known (its size if there are none)
+    """
+    sizes = {path: os.path.getsize(path) for path in files}
+    known = [path for path in files if path in history]
+    known_size = sum(sizes[path] for path in known)
+    rate = sum(history[path]
+               for path in known) / known_size if known_size else 1
+    return {
+        path: history[path] if path in history else round(sizes[path] * rate)
+        for path in files
+    }
+
+
+def plan(paths: list[str],
+         patterns: str,
+         shards: int,
+         options: Options,
+         history: dict[str, int] = None) -> dict:
+    """
+    Returns the manifest of a sharded scan of the python files in the paths:
+    the patterns file (and its hash), the options that change the findings
+    (which every shard must be run with) and the files of each shard,
+    balanced by size or by the time of their last analysis (`history`, see
+    `FindingsDB.costs`)
+    """
+    files = python_files(paths)
+    costs = estimate_costs(files, history or {})
+    with open(patterns, 'rb') as fh:
+        policy_hash = digest(fh.read())
+
+    parts = balance(costs, shards)
+    manifest = {
+        "version":
+        VERSION,
+        "patterns":
+        patterns,
+        "policy_hash":
+        policy_hash,
+        "options":
+        options.findings_options(),
+        "balance":
+        "size" if history is None else "cost",
+        "shards": [{
+            "shard": i,
+            "cost": sum(costs[path] for path in part),
+            "files": part
+        } for i, part in enumerate(parts)]
+    }
+    # Identifies the manifest in the partial results of its shards
+    manifest["id"] = digest(
+        json.dumps(manifest, sort_keys=True).encode("utf-8"))
+    return manifest
+
+
+def encode_findings(findings: dict[tuple, tuple[list, bool]]) -> list[dict]:
+    """
+    Returns the findings (see `Vulnerability.findings`) as JSON objects, in
+    order
+    """
+    return [{
+        "source": list(src),
+        "sink": list(sink),
+        "pattern": pattern,
+        "traces": traces,
+        "approximated": approximated
+    } for (src, sink, pattern), (traces, approximated) in findings.items()]
+
+
+def decode_findings(entries: list[dict]) -> dict[tuple, tuple[list, bool]]:
+    return {
+        (tuple(entry["source"]), tuple(entry["sink"]), entry["pattern"]):
+        (entry["traces"], entry["approximated"])
+        for entry in entries
+    }
+
+
+def run_shard(manifest: dict,
+              shard: int,
+              options: Options,
+              cache: ASTCache = None,
+              modules: ModuleCache = None) -> dict:
+    """
+    Analyses the files of a shard and returns its partial results, which
+    describe the manifest and shard they come from. The findings of files
+    whose content was already analysed (by any shard sharing the module
+    cache, if given) are taken from the cache. Files that can't be read, parsed
+    or analysed are recorded with their error, and the shard goes on.
+    """
+    if manifest["version"] != VERSION:
+        raise ValueError(f"unsupported manifest version {manifest['version']}")
+    if not 0 <= shard < len(manifest["shards"]):
+        raise ValueError(
+            f"no shard {shard} (the manifest has {len(manifest['shards'])})")
+
+    with open(manifest["patterns"], 'rb') as fh:
+        if digest(fh.read()) != manifest["policy_hash"]:
+            raise ValueError(
+                f"{manifest['patterns']} changed since the manifest was planned"
+            )
+    if options.findings_options() != manifest["options"]:
+        raise ValueError(
+            "the options that change the findings differ from the manifest's")
+    policy = load_policy(manifest["patterns"])
+
+    files = []
+    for path in manifest["shards"][shard]["files"]:
+        logging.info(f"Scanning {path} (shard {shard})")
+        # Files that can't be read are recorded without a hash
+        hash = ""
+        try:
+            source = load_source(path)
+            hash = digest(source)
+            if modules is not None:
+                findings, stats = modules.analyse(source, policy,
+                                                  manifest["policy_hash"],
+                                                  options, cache)
+            else:
+                findings, stats = analyse(source, policy, options, cache)
+        except (OSError, ValueError, SyntaxError, UnicodeDecodeError) as e:
+            logging.warning(f"Failed to analyse {path}: {e}")
+            files.append({
+                "path": path,
+                "hash": hash,
+                "elapsed_ms": 0,
+                "partial": False,
+                "error": f"{type(e).__name__}: {e}",
+                "findings": []
+            })
+            continue
+        files.append({
+            "path": path,
+            "hash": hash,
+            "elapsed_ms": stats.get("elapsed_ms"),
+            "partial": stats.budget_exceeded is not None,
+            "error": None,
+            "findings": encode_findings(findings)
+        })
+
+    return {
+        "version": VERSION,
+        "manifest": manifest["id"],
+        "shard": shard,
+        "shards": len(manifest["shards"]),
+        "policy_hash": manifest["policy_hash"],
+        "options": options.findings_options(),
+        "files": files
+    }
+
+
+def merge(manifest: dict, partials: list[dict]) -> list[dict]:
+    """
+    Checks that the partial results are those of every shard of the manifest
+    (once each, run with its options) and returns the results of its files,
+    ordered by path, so they don't depend on how the files were sharded
+    """
+    shards = {}
+    for partial in partials:
+        if partial["version"] != VERSION or partial["manifest"] != manifest[
+                "id"]:
+            raise ValueError(
+                f"partial results of shard {partial['shard']} are from another manifest"
+            )
+        if partial["options"] != manifest["options"]:
+            raise ValueError(
+                f"partial results of shard {partial['shard']} were run with other options"
+            )
+        if partial["shard"] not in range(len(manifest["shards"])):
+            raise ValueError(
+                f"no shard {partial['shard']} (the manifest has {len(manifest['shards'])})"
+            )
+        if partial["shard"] in shards:
+            raise ValueError(
+                f"shard {partial['shard']} has several partial results")
+        expected = manifest["shards"][partial["shard"]]["files"]
+        if [file["path"] for file in partial["files"]] != expected:
+            raise ValueError(
+                f"partial results of shard {partial['shard']} don't match its files"
+            )
+        shards[partial["shard"]] = partial
+
+    missing = [
+        str(i) for i in range(len(manifest["shards"])) if i not in shards
+    ]
+    if missing:
+        raise ValueError(f"missing shards {', '.join(missing)}")
+
+    files = [file for partial in shards.values() for file in partial["files"]]
+    return sorted(files, key=lambda file: file["path"])
+
+
+def report(files: list[dict]) -> dict:
+    """
+    Returns the report of the merged results: the findings of every file, in
+    order, as in the output of the analysis, but numbered across files (so the
+    numbers don't depend on the sharding either), the files whose findings
+    are partial and the ones that couldn't be analysed
+    """
+    count = {}
+    findings = []
+    for file in files:
+        for entry in file["findings"]:
+            pattern = entry["pattern"]
+            formatted = Vulnerability.findings_to_list(decode_findings([entry
+                                                                        ]))[0]
+            count[pattern] = count.get(pattern, 0) + 1
+            formatted["vulnerability"] = f"{pattern}_{count[pattern]}"
+            findings.append({"file": file["path"], **formatted})
+
+    return {
+        "files":
+        len(files),
+        "partial_files": [file["path"] for file in files if file["partial"]],
+        "failed_files": [{
+            "path": file["path"],
+            "error": file["error"]
+        } for file in files if file["error"] is not None],
+        "findings":
+        findings
+    }
+
+
+def record(files: list[dict], manifest: dict, db: FindingsDB):
+    """
+    Records the merged results in a findings database (the time of each file
+    is then used to balance the next plan)
+    """
+    policy_hash = manifest["policy_hash"]
+    options_hash = Options(**manifest["options"]).findings_hash()
+    for file in files:
+        if file["error"] is not None:
+            db.record_failure(file["path"], file["hash"], policy_hash,
+                              options_hash, file["error"])
+            continue
+        db.record(file["path"], file["hash"], policy_hash, options_hash,
+                  decode_findings(file["findings"]), file["elapsed_ms"],
+                  file["partial"])
+    db.commit()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, filename="log.log", filemode="w")
+
+    parser = argparse.ArgumentParser(
+        prog='shard',
+        description=
+        'splits a scan of many files among several nodes (or processes) that share a filesystem, and merges their results'
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    plan_parser = commands.add_parser(
+        'plan', help='writes the manifest of the files of each shard')
+    plan_parser.add_argument('patterns')
+    plan_parser.add_argument('paths', nargs='+')
+    plan_parser.add_argument('--shards', type=int, required=True)
+    plan_parser.add_argument('--manifest', required=True, metavar='FILE')
+    plan_parser.add_argument(
+        '--db',
+        metavar='FILE',
+        help=
+        'findings database (see scan.py) whose analysis times balance the shards (by size otherwise)'
+    )
+    Options.add_arguments(plan_parser)
+
+    run_parser = commands.add_parser('run-shard',
+                                     help='analyses the files of a shard')
+    run_parser.add_argument('manifest')
+    run_parser.add_argument('--shard', type=int, required=True)
+    run_parser.add_argument('--output',
+                            required=True,
+                            metavar='FILE',
+                            help='file where the partial results are written')
+    Options.add_arguments(run_parser)
+
+    merge_parser = commands.add_parser(
+        'merge', help='merges the partial results of every shard')
+    merge_parser.add_argument('manifest')
+    merge_parser.add_argument('partials', nargs='+')
+    merge_parser.add_argument('--output',
+                              metavar='FILE',
+                              help='file where the report is written')
+    merge_parser.add_argument('--db',
+                              metavar='FILE',
+                              help='findings database to record them in')
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'plan':
+            history = None
+            if args.db is not None:
+                db = FindingsDB(args.db)
+                history = db.costs()
+                db.close()
+            manifest = plan(args.paths, args.patterns, args.shards,
+                            Options.from_args(args), history)
+            write_json(args.manifest, manifest)
+            for shard in manifest["shards"]:
+                print(
+                    f"shard: shard {shard['shard']}: {len(shard['files'])} files, cost {shard['cost']}"
+                )
+
+        elif args.command == 'run-shard':
+            options = Options.from_args(args)
+            write_json(
+                args.output,
+                run_shard(read_json(args.manifest), args.shard, options,
+                          ASTCache.from_options(options),
+                          ModuleCache.from_options(options)))
+
+        else:
+            manifest = read_json(args.manifest)
+            files = merge(manifest,
+                          [read_json(partial) for partial in args.partials])
+            content = report(files)
+            for file in content["failed_files"]:
+                print(
+                    f"shard: failed to analyse {file['path']}: {file['error']}",
+                    file=sys.stderr)
+            if args.output is not None:
+                write_json(args.output, content)
+            else:
+                print(json.dumps(content, indent=4))
+            if args.db is not None:
+                db = FindingsDB(args.db)
+                record(files, manifest, db)
+                db.close()
+    except ValueError as e:
+        print(f"shard: {e}", file=sys.stderr)
+        sys.exit(1)
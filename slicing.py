@@ -0,0 +1,186 @@
+from __future__ import annotations
+import ast, copy
+import dataflow
+from flow_follow import Policy
+
+# Statements that replace the multilabelling by a new one (the others return
+# it unchanged or evaluate to a multilabel)
+RENEWING = (ast.Assign, ast.AugAssign, ast.If, ast.While, ast.For)
+
+JUMPS = (ast.Break, ast.Continue)
+
+# Statements that `IFVisitor` analyses (it raises ValueError for the others)
+ANALYSED = RENEWING + JUMPS + (ast.Expr, ast.Pass)
+
+
+def is_sink_site(stmt: ast.stmt, sinks: set[str]) -> bool:
+    """
+    Returns whether a statement (not including its body) calls or assigns to
+    some sink
+    """
+    names = dataflow.called_in(dataflow.header_of(stmt)) | dataflow.defs(stmt)
+    return not names.isdisjoint(sinks)
+
+
+def read_attributes(stmt: ast.stmt) -> set[str]:
+    """
+    Returns the attributes read by a statement (not including its body)
+    """
+    header = dataflow.header_of(stmt)
+    if header is None:
+        return set()
+    return {el.attr for el in ast.walk(header) if type(el) == ast.Attribute}
+
+
+def mark(stmts: list[ast.stmt],
+         relevant: set[str],
+         sinks: set[str],
+         implicit: bool,
+         leaks: bool = False) -> bool:
+    """
+    Adds to `relevant` the names that the statements that reach some sink
+    depend on. Returns whether some statement of the block reaches a sink
+    (calls or assigns to one, or assigns to a relevant name). `leaks` is
+    whether loops leak through their termination (see
+    `Options.termination_leak`).
+    """
+    reaches = False
+    for stmt in stmts:
+        inner = False
+        for block in dataflow.blocks_of(stmt):
+            inner = mark(block, relevant, sinks, implicit, leaks) or inner
+
+        own = is_sink_site(
+            stmt, sinks) or not dataflow.defs(stmt).isdisjoint(relevant)
+        if own:
+            relevant |= dataflow.uses(stmt)
+
+        # Control dependencies: the condition is part of the context of the
+        # body (and, with termination leaks, of everything after a loop)
+        if implicit and (inner or leaks and dataflow.is_loop(stmt)):
+            relevant |= dataflow.names_in(dataflow.header_of(stmt))
+
+        reaches = reaches or own or inner
+
+    return reaches
+
+
+def renewal(stmt: ast.stmt) -> ast.Assign:
+    """
+    Returns an assignment without targets, that only replaces the
+    multilabelling by a copy of it (as the statement it stands for would)
+    """
+    return ast.Assign(targets=[],
+                      value=ast.Constant(None, lineno=stmt.lineno),
+                      lineno=stmt.lineno)
+
+
+def is_renewal(stmt: ast.stmt) -> bool:
+    return type(stmt) == ast.Assign and not stmt.targets
+
+
+def rebuild(stmts: list[ast.stmt],
+            relevant: set[str],
+            sinks: set[str],
+            attributes: set[str],
+            leaks: bool = False) -> tuple[list[ast.stmt], bool]:
+    """
+    Returns the statements of the block that are in the slice, and whether
+    some of them reach a sink. Adds to `attributes` the attributes read by
+    those statements. `leaks` is whether the conditions of loops are part of
+    the context after them (for implicit patterns), in which case every loop
+    is kept.
+    """
+    kept = []
+    reaches = False
+    pending = None
+    for stmt in stmts:
+        blocks = [
+            rebuild(block, relevant, sinks, attributes, leaks)
+            for block in dataflow.blocks_of(stmt)
+        ]
+        inner = any(block_reaches for _, block_reaches in blocks)
+
+        # Statements that only read relevant names are kept as well, since
+        # the first read of an uninitialized name sets its line number
+        own = is_sink_site(
+            stmt, sinks) or not (dataflow.defs(stmt)
+                                 | dataflow.uses(stmt)).isdisjoint(relevant)
+
+        if type(stmt) not in ANALYSED:
+            # So that the analysis fails on them as it would without slicing
+            keep = True
+        elif type(stmt) in JUMPS:
+            keep = True
+        elif dataflow.is_loop(stmt):
+            # Jumps only matter for the loop they are in
+            keep = own or inner or leaks
+        else:
+            keep = own or any(not is_renewal(kept_stmt) for block, _ in blocks
+                              for kept_stmt in block)
+
+        if not keep:
+            if pending is None and type(stmt) in RENEWING:
+                pending = stmt
+            continue
+
+        # Reads after a dropped statement must not see the multilabelling
+        # that was current before it
+        if pending is not None:
+            kept.append(renewal(pending))
+            pending = None
+
+        if blocks:
+            new = copy.copy(stmt)
+            new.body = blocks[0][0] or [ast.Pass(lineno=stmt.lineno)]
+            if type(stmt) == ast.If:
+                new.orelse = blocks[1][0]
+            stmt = new
+
+        kept.append(stmt)
+        attributes |= read_attributes(stmt)
+        reaches = reaches or own or inner
+
+    if pending is not None:
+        kept.append(renewal(pending))
+
+    return kept, reaches
+
+
+def slice_tree(tree: ast.Module,
+               policy: Policy,
+               leaks: bool = False) -> ast.Module:
+    """
+    Returns the backward slice of the module from the sinks of the policy:
+    the statements that the calls and assignments to sinks (transitively)
+    depend on, including control dependencies for implicit patterns (and, if
+    `leaks`, the conditions of loops for what follows them). The statements
+    are the original nodes, so the line numbers reported are the same.
+    """
+    sinks = {sink for p in policy.patterns for sink in p.sinks}
+    implicit = len(policy.get_implicit_vulnerabilities()) > 0
+
+    relevant = set()
+    while True:
+        size = -1
+        while size != len(relevant):
+            size = len(relevant)
+            mark(tree.body, relevant, sinks, implicit, leaks)
+
+        # Attributes (unlike names) can't be read while uninitialized, so the
+        # assignments to the ones read in the slice are kept as well
+        attributes = set()
+        body, _ = rebuild(tree.body,
+                          relevant,
+                          sinks,
+                          attributes,
+                          leaks=implicit and leaks)
+        if attributes <= relevant:
+            break
+        relevant |= attributes
+
+    return ast.Module(body=body, type_ignores=[])
+
+
+def count_statements(tree: ast.AST) -> int:
+    return sum(1 for node in ast.walk(tree) if isinstance(node, ast.stmt))
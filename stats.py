@@ -0,0 +1,71 @@
+from __future__ import annotations
+import json
+
+
+class Stats:
+    """
+    Statistics collected during the analysis of a slice (written with
+    `--stats`). Counters are plain integers identified by name.
+    """
+
+    def __init__(self):
+        self.counters = {}
+
+        # Counters that keep a maximum (see `peak`)
+        self.peaks = set()
+
+        # Name of the budget that was exceeded and the line where it happened
+        # (the findings are partial if set)
+        self.budget_exceeded = None
+
+        # Memory profile of the analysis, if requested (see
+        # `memory.MemoryProfile`)
+        self.memory = None
+
+    def incr(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def peak(self, name: str, value: int):
+        """
+        Keeps the maximum of the values reported for a counter
+        """
+        self.peaks.add(name)
+        if value > self.counters.get(name, 0):
+            self.counters[name] = value
+
+    def get(self, name: str) -> int:
+        return self.counters.get(name, 0)
+
+    def merge(self, other: Stats):
+        """
+        Adds the statistics of another (part of the) analysis
+        """
+        for name in other.counters:
+            if name in other.peaks:
+                self.peak(name, other.counters[name])
+            else:
+                self.incr(name, other.counters[name])
+        if other.budget_exceeded is not None:
+            self.exceeded(*other.budget_exceeded)
+        if other.memory is not None:
+            if self.memory is None:
+                self.memory = other.memory
+            else:
+                self.memory.merge(other.memory)
+
+    def exceeded(self, budget: str, lineno: int):
+        """
+        Records that a budget was exceeded (only the first one is kept)
+        """
+        if self.budget_exceeded is None:
+            self.budget_exceeded = (budget, lineno)
+
+    def __repr__(self) -> str:
+        return f"Stats {{ {self.counters}, budget_exceeded={self.budget_exceeded} }}"
+
+    def to_json(self) -> str:
+        d = dict(self.counters)
+        if self.budget_exceeded is not None:
+            budget, lineno = self.budget_exceeded
+            d["budget_exceeded"] = {"budget": budget, "lineno": lineno}
+        return json.dumps(d, indent=4)
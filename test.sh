@@ -17,7 +17,11 @@ run_test() {
 		output="$folder/$name.output.json"
 		myout="$folder/$name.my.json"
 		log="$folder/$name.log"
-		timeout $TIMEOUT $run $script $patterns > $myout 2> $log
+		args=""
+		if [ -f "$folder/$name.args" ]; then
+			args=$(cat "$folder/$name.args")
+		fi
+		timeout $TIMEOUT $run $script $patterns $args > $myout 2> $log
 		if [ $? -eq 0 ];
 		then
 			./compare $output $myout &>> $log
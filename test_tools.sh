@@ -0,0 +1,197 @@
+#! /bin/bash
+# Tests of the tools built on the analyser (scans, shards, caches, library
+# API). Each test runs them in its own scratch directory and compares what
+# they print with what is expected.
+
+RED="\e[31m"
+GREEN="\e[32m"
+ENDCOLOR="\e[0m"
+
+root=$(pwd)
+scratch=$(mktemp -d)
+trap 'rm -rf "$scratch"' EXIT
+
+# Runs a tool (a python file of the repository) in the scratch directory, so
+# its log doesn't end up in the repository
+tool() {
+	(cd "$scratch" && python3 "$root/$@" 2>&1)
+}
+
+expect() {
+	name=$1
+	expected=$2
+	actual=$3
+	echo -n "$name: "
+	if [ "$expected" == "$actual" ];
+	then
+		echo -e "$GREEN success $ENDCOLOR"
+	else
+		echo -e "$RED failed $ENDCOLOR"
+		diff <(echo "$expected") <(echo "$actual")
+	fi
+}
+
+# Creates a directory of files to scan, copied from the slices of the tests
+sources() {
+	dir=$scratch/$1
+	mkdir -p "$dir"
+	shift
+	for name in "$@"; do
+		cp "$root/tests/$name.py" "$dir/$name.py"
+	done
+	echo "$dir"
+}
+
+test_scan_unchanged() {
+	dir=$(sources scan-unchanged 1a-assignments 6a-sanitizers)
+	patterns=$root/tests/1a-assignments.patterns.json
+	tool scan.py "$patterns" "$dir" --db "$dir.db" > /dev/null
+	expect scan-unchanged "scan: 0 files analysed, 2 unchanged, 0 failed" \
+		"$(tool scan.py "$patterns" "$dir" --db "$dir.db")"
+
+	echo "x = 1" >> "$dir/6a-sanitizers.py"
+	expect scan-changed "scan: 1 files analysed, 1 unchanged, 0 failed" \
+		"$(tool scan.py "$patterns" "$dir" --db "$dir.db")"
+}
+
+test_scan_options() {
+	dir=$(sources scan-options 1a-assignments)
+	patterns=$root/tests/1a-assignments.patterns.json
+	tool scan.py "$patterns" "$dir" --db "$dir.db" > /dev/null
+	expect scan-findings-option "scan: 1 files analysed, 0 unchanged, 0 failed" \
+		"$(tool scan.py "$patterns" "$dir" --db "$dir.db" --max-flows 2)"
+	expect scan-other-option "scan: 0 files analysed, 1 unchanged, 0 failed" \
+		"$(tool scan.py "$patterns" "$dir" --db "$dir.db" --max-flows 2 --no-liveness)"
+}
+
+test_scan_partial() {
+	dir=$(sources scan-partial 14a-budget)
+	patterns=$root/tests/14a-budget.patterns.json
+	tool scan.py "$patterns" "$dir" --db "$dir.db" --iteration-budget 1 > /dev/null
+	expect scan-partial "scan: 1 files analysed, 0 unchanged, 0 failed" \
+		"$(tool scan.py "$patterns" "$dir" --db "$dir.db" --iteration-budget 1)"
+}
+
+test_scan_failed() {
+	dir=$(sources scan-failed 1a-assignments)
+	patterns=$root/tests/1a-assignments.patterns.json
+	# Files without sinks aren't parsed, so this one mentions c
+	echo "c = (" > "$dir/broken.py"
+	tool scan.py "$patterns" "$dir" --db "$dir.db" > /dev/null
+	expect scan-failed "scan: 0 files analysed, 1 unchanged, 1 failed" \
+		"$(tool scan.py "$patterns" "$dir" --db "$dir.db")"
+	# (the message of the error depends on the python version)
+	expect scan-failures "$dir/broken.py: SyntaxError" \
+		"$(tool findings_db.py "$dir.db" failures | cut -d : -f 1,2)"
+}
+
+test_ast_cache() {
+	dir=$(sources ast-cache 1a-assignments)
+	patterns=$root/tests/1a-assignments.patterns.json
+	tool scan.py "$patterns" "$dir" --db "$dir.1.db" --ast-cache "$dir.cache" > /dev/null
+	expect ast-cache-hit "scan: AST cache 1 hits, 0 misses, 0 evictions" \
+		"$(tool scan.py "$patterns" "$dir" --db "$dir.2.db" --ast-cache "$dir.cache" | tail -1)"
+
+	for entry in "$dir.cache"/*.pickle; do
+		echo "corrupt" > "$entry"
+	done
+	expect ast-cache-corrupt "scan: AST cache 0 hits, 1 misses, 1 evictions" \
+		"$(tool scan.py "$patterns" "$dir" --db "$dir.3.db" --ast-cache "$dir.cache" | tail -1)"
+	expect ast-cache-findings "$(tool findings_db.py "$dir.1.db" findings)" \
+		"$(tool findings_db.py "$dir.3.db" findings)"
+	expect ast-cache-replaced "scan: AST cache 1 hits, 0 misses, 0 evictions" \
+		"$(tool scan.py "$patterns" "$dir" --db "$dir.4.db" --ast-cache "$dir.cache" | tail -1)"
+}
+
+test_module_cache() {
+	# Files with the same content are analysed once
+	dir=$(sources module-cache 1a-assignments)
+	cp "$dir/1a-assignments.py" "$dir/copy.py"
+	patterns=$root/tests/1a-assignments.patterns.json
+	expect module-cache-copy "scan: module cache 1 hits, 1 misses, 0 evictions" \
+		"$(tool scan.py "$patterns" "$dir" --db "$dir.1.db" --module-cache "$dir.cache" | tail -1)"
+	expect module-cache-findings "2" "$(tool findings_db.py "$dir.1.db" findings | wc -l)"
+	# (other options that change the findings have their own entries)
+	expect module-cache-options "scan: module cache 1 hits, 1 misses, 0 evictions" \
+		"$(tool scan.py "$patterns" "$dir" --db "$dir.2.db" --module-cache "$dir.cache" --max-flows 2 | tail -1)"
+
+	for entry in "$dir.cache"/*.pickle; do
+		echo "corrupt" > "$entry"
+	done
+	expect module-cache-corrupt "scan: module cache 1 hits, 1 misses, 1 evictions" \
+		"$(tool scan.py "$patterns" "$dir" --db "$dir.3.db" --module-cache "$dir.cache" | tail -1)"
+	expect module-cache-corrupt-findings "$(tool findings_db.py "$dir.1.db" findings)" \
+		"$(tool findings_db.py "$dir.3.db" findings)"
+}
+
+test_api() {
+	# The library API gives the output of the analyser, on every test that
+	# runs with the default options
+	names=$(ls "$root/tests" | grep "\.py$" | cut -d . -f 1 | while read name; do
+		[ -f "$root/tests/$name.args" ] || echo "$name"
+	done)
+	# (the API doesn't read TERMINATION_LEAK)
+	expected=$(unset TERMINATION_LEAK; for name in $names; do
+		tool py_analyser.py "$root/tests/$name.py" "$root/tests/$name.patterns.json"
+	done)
+	actual=$(cd "$scratch" && python3 - "$root" $names <<-EOF
+		import sys
+		sys.path.insert(0, sys.argv[1])
+		import api
+		for name in sys.argv[2:]:
+		    tests = f"{sys.argv[1]}/tests/{name}"
+		    with open(f"{tests}.py", "rb") as fh:
+		        code = fh.read()
+		    print(api.analyse(code, api.compile_policy(f"{tests}.patterns.json")).to_json())
+		EOF
+	)
+	expect api-output "$expected" "$actual"
+}
+
+test_memory_profile() {
+	# Profiling the memory doesn't change the findings
+	for name in 18a-liveness 19a-loop-memo 27a-loop-closure; do
+		slice=$root/tests/$name.py
+		patterns=$root/tests/$name.patterns.json
+		expect "memory-profile-$name" "$(tool py_analyser.py "$slice" "$patterns")" \
+			"$(tool py_analyser.py "$slice" "$patterns" --memory-profile "$scratch/$name.memory.json")"
+	done
+
+	expect memory-profile-report "allocation_sites lines peak_flows_by_pattern peak_objects peak_traced_kib" \
+		"$(python3 -c 'import json, sys; print(*sorted(json.load(open(sys.argv[1]))))' "$scratch/19a-loop-memo.memory.json")"
+}
+
+test_scan_unreadable() {
+	dir=$(sources scan-unreadable 1a-assignments)
+	patterns=$root/tests/1a-assignments.patterns.json
+	ln -s "$dir/missing.py" "$dir/unreadable.py"
+	expect scan-unreadable "scan: 1 files analysed, 0 unchanged, 1 failed" \
+		"$(tool scan.py "$patterns" "$dir" --db "$dir.db")"
+	expect scan-unreadable-failures "$dir/unreadable.py: FileNotFoundError" \
+		"$(tool findings_db.py "$dir.db" failures | cut -d : -f 1,2)"
+}
+
+test_shard() {
+	dir=$(sources shard 1a-assignments 6a-sanitizers 14a-budget)
+	patterns=$root/tests/1a-assignments.patterns.json
+	tool shard.py plan "$patterns" "$dir" --shards 2 --manifest "$dir.json" > /dev/null
+	for shard in 0 1; do
+		tool shard.py run-shard "$dir.json" --shard $shard --output "$dir.$shard.json"
+	done
+
+	expect shard-merge-order "$(tool shard.py merge "$dir.json" "$dir.0.json" "$dir.1.json")" \
+		"$(tool shard.py merge "$dir.json" "$dir.1.json" "$dir.0.json")"
+	expect shard-merge-missing "shard: missing shards 1" \
+		"$(tool shard.py merge "$dir.json" "$dir.0.json")"
+	expect shard-merge-duplicate "shard: shard 0 has several partial results" \
+		"$(tool shard.py merge "$dir.json" "$dir.0.json" "$dir.0.json" "$dir.1.json")"
+
+	sed 's/"shard": 1,/"shard": 2,/' "$dir.1.json" > "$dir.2.json"
+	expect shard-merge-unknown "shard: no shard 2 (the manifest has 2)" \
+		"$(tool shard.py merge "$dir.json" "$dir.0.json" "$dir.2.json")"
+}
+
+echo "Running tool tests..."
+for test in $(declare -F | cut -d " " -f 3 | grep "^test_"); do
+	$test
+done
@@ -0,0 +1,5 @@
+# sanitization paths longer than the limit are summarized
+d = a()
+e = b1(b2(b3(d)))
+c(e)
+c(b1(b2(d)))
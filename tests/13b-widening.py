@@ -0,0 +1,8 @@
+# sanitizers applied in different orders in a loop
+d = a()
+while d != 0:
+    if d == 1:
+        d = b1(d)
+    else:
+        d = b2(d)
+c(d)
@@ -0,0 +1,19 @@
+# the first loop exceeds the iteration budget, so it is not analysed up to its
+# fixed point (the flow from `source` to `d` is missed). The second loop is
+# analysed with a single iteration, but the findings after it are still reported
+a = source()
+b = None
+c = None
+d = None
+while True:
+    d = c
+    c = b
+    b = a
+sink(d)
+e = None
+f = None
+while True:
+    f = e
+    e = a
+sink(f)
+sink(b)
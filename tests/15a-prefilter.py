@@ -0,0 +1,4 @@
+# no sink is mentioned, so the slice is not even parsed
+d = a()
+b(d)
+print(d)
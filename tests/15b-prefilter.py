@@ -0,0 +1,3 @@
+# the sink is written with fullwidth characters (normalized by python)
+d = a()
+ｃ(d)
@@ -0,0 +1,6 @@
+# out is only read, never called nor assigned, so B is dropped before the
+# analysis (and the findings of A are the same as with B)
+a = src()
+if out:
+    b = a + out
+snk(b)
@@ -0,0 +1,11 @@
+# patterns are analysed in parallel (split among two processes)
+d = a()
+e = b(d)
+if e:
+    f = c(d)
+    g = x()
+else:
+    f = e
+g = y(f)
+c(g)
+z(g, f)
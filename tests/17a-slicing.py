@@ -0,0 +1,9 @@
+# only the statements c depends on are analysed (the loop is not)
+if a():
+    x = b(a())
+e = 0
+while e:
+    e = e + d()
+    print(e)
+f = x
+c(f)
@@ -0,0 +1,9 @@
+# names are dropped from the state once they are no longer read (x after
+# line 3, z always), which doesn't change the flows found
+x = a()
+y = x
+while y:
+    t = b(y)
+    z = t
+    y = t
+c(y)
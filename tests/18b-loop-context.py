@@ -0,0 +1,4 @@
+# the state doesn't change, but the second iteration is analysed in the
+# context of the first condition (where a was sanitized by b)
+while b(x) == a:
+    c(x)
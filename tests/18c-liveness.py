@@ -0,0 +1,10 @@
+# e is live after the if, since both of its branches jump (back to the head of
+# the loop, where it is read)
+while c:
+    snk(e)
+    e = src()
+    if x:
+        continue
+    else:
+        break
+    e = ""
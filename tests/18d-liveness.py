@@ -0,0 +1,11 @@
+# a jump skips the rest of its block, so what's live at the end of the blocks
+# it's in (up to the loop) is live after it: a is read after the if, even
+# though the code after the continue assigns it
+while c:
+    if x:
+        a = src()
+        continue
+        a = ""
+    else:
+        a = ""
+    snk(a)
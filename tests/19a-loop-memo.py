@@ -0,0 +1,11 @@
+# the inner loop is reached with the same state on most iterations of the
+# outer one, and its analysis is reused (the flows found are the same)
+x = a()
+y = None
+while x:
+    i = y
+    while i:
+        c(i)
+        i = b(i)
+    y = x
+c(i)
@@ -0,0 +1,9 @@
+# the straight-line code in the loop (lines 5 to 8) is summarized once and
+# applied as a whole on every iteration
+x = a()
+while y:
+    z = b(y)
+    y.f = x
+    c(z)
+    x = b(w) + z
+c(x)
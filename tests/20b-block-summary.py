@@ -0,0 +1,13 @@
+# summaries add the labels in the order of their terms, which must not keep
+# loops from reaching their fixed point
+e = san()
+if 1:
+    c += (snk(b + d) == '' + e)
+    a = c
+for c in (a == (c == (c == c))):
+    b = a
+    c = (not (d and a + a))
+    while True:
+        a = (((not c) == (not e)) == (f(a) == e))
+        w = (((b and a) == (c == a)) and (d == d))
+        d += w
@@ -0,0 +1,7 @@
+# the first read of an attribute assigned in a summarized block resolves the
+# uninitialized value of its name, as when the block is analysed statement by
+# statement
+while x:
+    a.b = a
+    d = a
+e = a
@@ -0,0 +1,6 @@
+# two policy files (see the .args file) with a pattern of the same name are
+# analysed at once, and the findings are reported for each of them
+x = a()
+y = b(x)
+c(y)
+d(x)
@@ -0,0 +1,7 @@
+# three policy files (see the .args file), two of them with the same name and
+# one named as the second of those would be numbered, are kept apart
+x = a()
+c(x)
+y = b()
+d(y)
+e(x)
@@ -0,0 +1,8 @@
+a = src()
+b = san(a)
+while cond(a):
+    b = san(a)
+    a = a + b
+snk(b)
+x = other()
+snk2(x)
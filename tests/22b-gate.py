@@ -0,0 +1,7 @@
+# with several policy files, the gate prints the findings of each of them (as
+# without the gate): here none, since every flow of A is sanitized
+a = src()
+b = san(a)
+snk(b)
+x = other()
+snk2(san(x))
@@ -0,0 +1,18 @@
+if False:
+    # debugging code, never run
+    sink(source())
+while 0:
+    a = source()
+if not False and True:
+    b = clean()
+else:
+    b = source()
+while True:
+    b = b + a
+    if cond(b):
+        break
+sink(b)
+c = source()
+while True:
+    c = san(c)
+sink(c)
@@ -0,0 +1,11 @@
+if cond():
+    x = a()
+while check(x):
+    y.f = x
+    if cond():
+        z = b()
+    w = z
+sink(y)
+sink(z)
+sink(x)
+sink(w)
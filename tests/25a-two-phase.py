@@ -0,0 +1,10 @@
+a = source()
+b = other()
+i = 0
+while i < n:
+    a = clean(a)
+    a = escape(a)
+    b = escape(b)
+    i = i + 1
+sink(a)
+log(b)
@@ -0,0 +1,15 @@
+# the loop body is a single block, so after the first iteration only the flows
+# it adds are followed along the chain (from `a` to `e`, through the sanitizer
+# and into the condition) until none is new
+a = source()
+b = ''
+c = ''
+d = ''
+e = ''
+while d != e:
+    sink(e)
+    e = sanitize(d)
+    d = c + d
+    c = b
+    b = a
+sink(e)
@@ -0,0 +1,8 @@
+# reads of the same name or attribute chain are evaluated once, and reused
+# until the name is assigned (the attributes aren't initialized, so they are
+# sources of their own, at the line of each read)
+request = source()
+query = request.args + request.args.get
+sink(request.args, request.form, query)
+request = sanitize(request)
+sink(request.args, query, request.args)
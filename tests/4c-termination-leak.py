@@ -0,0 +1,7 @@
+# with termination leaks, the loop (and the ifs around it) are kept in the
+# slice, since its condition is part of the context of the assignment after it
+if 1:
+    if (x or ("s" or "s")):
+        while (not 1):
+            pass
+    b = sink(src(), f("s"))